@@ -1,45 +1,78 @@
+import os
+import sys
 from collections import Counter
+from itertools import islice
 
 # Define the file path
 file_path = "dupli.txt"
+BUFFER_SIZE = 8 * 1024 * 1024  # Write buffer so streamed lines coalesce into large writes
+WRITE_BATCH = 65536  # Fixed-width records joined per write
 
-# Open the file and read all lines
-with open(file_path, 'r') as file:
-    lines = file.readlines()
+# Read the whole file as one bytes blob and split it (with and without line endings)
+with open(file_path, 'rb') as file:
+    try:
+        # Read-ahead aggressively, then drop the pages: the data is only read once
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        data = file.read()
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except AttributeError:  # posix_fadvise is not available on Windows
+        data = file.read()
 
-# Strip the newline characters from each line to handle lines consistently
-stripped_lines = [line.strip() for line in lines]
+# Lines without their \n / \r\n endings are the keys, so no per-line strip() copies
+keys = data.splitlines()
 
-# Count occurrences of each stripped line
-line_counts = Counter(stripped_lines)
+# Address dumps are usually fixed-width records. When every line is exactly `width`
+# bytes plus '\n', a line is just its key plus a newline, so the copy of every line
+# with its ending and the first-line map below are not needed
+width = data.find(b'\n')
+num_records = len(data) // (width + 1) if width > 0 else 0
+fixed_width = (num_records > 0 and num_records * (width + 1) == len(data) and b'\r' not in data
+               and data.count(b'\n') == num_records and data[width::width + 1] == b'\n' * num_records)
+lines = None if fixed_width else data.splitlines(keepends=True)
+del data
 
-# Find duplicates
-duplicates = {line: count for line, count in line_counts.items() if count > 1}
+# Count occurrences in C; the Counter keeps keys in first-occurrence order
+line_counts = Counter(keys)
 
 # Track the total number of duplicates deleted
-total_deleted = 0
+total_deleted = len(keys) - len(line_counts)
 
-if duplicates:
-    # Print duplicates and their counts
-    for line, count in duplicates.items():
-        print(f"{line:<40} {count} duplications.")
-        total_deleted += (count - 1)  # Subtract 1 to account for keeping the first occurrence
+if total_deleted:
+    # Print duplicates and their counts through the buffered stream, without a print call per line
+    sys.stdout.writelines(f"{line.decode('utf-8', errors='replace'):<40} {count} duplications.\n"
+                          for line, count in line_counts.items() if count > 1)
 else:
     print("No duplicates found.")
-    exit()
+    sys.exit(0)
 
-# Remove duplicates while keeping the first occurrence
-unique_lines = []
-seen = set()
+if fixed_width:
+    # The Counter's keys are already the unique records in first-occurrence order
+    unique_keys = list(line_counts)
 
-for line, stripped_line in zip(lines, stripped_lines):
-    if stripped_line not in seen:
-        unique_lines.append(line)
-        seen.add(stripped_line)
+    # Everything before the first removed line is already in place on disk
+    keep_prefix = next((i for i, (unique_key, key) in enumerate(zip(unique_keys, keys))
+                        if unique_key != key), len(unique_keys))
+    write_pos = keep_prefix * (width + 1)
+    tail = (b'\n'.join(unique_keys[i:i + WRITE_BATCH]) + b'\n'
+            for i in range(keep_prefix, len(unique_keys), WRITE_BATCH))
+else:
+    # Map each key to its first original line: walking in reverse lets
+    # the earliest occurrence be the last one assigned
+    first_lines = dict(zip(reversed(keys), reversed(lines)))
+    unique_lines = [first_lines[line] for line in line_counts]
+
+    # Everything before the first removed line is already in place on disk
+    keep_prefix = next((i for i, (unique_line, line) in enumerate(zip(unique_lines, lines))
+                        if unique_line is not line), len(unique_lines))
+    write_pos = sum(map(len, lines[:keep_prefix]))
+    tail = islice(unique_lines, keep_prefix, None)
 
-# Write the unique lines back to the file
-with open(file_path, 'w') as file:
-    file.writelines(unique_lines)
+# Rewrite only the tail of the file in place, streaming the kept lines without
+# joining them into one big copy, and cut the file to the new length
+with open(file_path, 'r+b', buffering=BUFFER_SIZE) as file:
+    file.seek(write_pos)
+    file.writelines(tail)
+    file.truncate()
 
 # Print the total number of deleted duplicates
 if total_deleted > 0:
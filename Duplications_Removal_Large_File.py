@@ -1,39 +1,324 @@
+import heapq
+import mmap
+import os
+import sys
+import tempfile
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from hashlib import blake2b
 
 # Define the file path
 file_path = "duply.txt"
+output_path = "Receiving_Addresses_without_duplications.txt"
 
-# First pass: Count occurrences of each line without loading the entire file into memory
-line_counts = Counter()
+# Files larger than this are deduplicated with an external sort instead of an in-memory set
+MEMORY_LIMIT_GB = 4
+BUFFER_SIZE = 8 * 1024 * 1024  # Per-run read-ahead buffer during the merge
+MIN_CHUNK_SIZE = 64 * 1024 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024 * 1024
+WORKERS = os.cpu_count() or 1  # Processes building sorted runs in parallel on the external path
+# Memory of one first_seen entry besides its key data: the bytes object header (33),
+# the [offset, count] list (72) and the offset int (32). The dict table is added separately
+ENTRY_OVERHEAD = 33 + 72 + 32
 
-with open(file_path, 'r') as file:
-    for line in file:
-        stripped_line = line.strip()
-        line_counts[stripped_line] += 1
 
-# Identify duplicates
-duplicates = {line: count for line, count in line_counts.items() if count > 1}
+def iter_lines(mm, pos=0, stop=None):
+    """Yield (start, key_end, end) offsets of each line in mm[pos:stop]
 
-# Track the total number of duplicates deleted
-total_deleted = sum(count - 1 for count in duplicates.values())
+    mm[start:end] is the raw line including its newline, mm[start:key_end] is the
+    line without the trailing \n or \r\n and is used as the dedup key.
+    """
+    size = len(mm) if stop is None else stop
+    while pos < size:
+        nl = mm.find(b'\n', pos, size)
+        if nl == -1:
+            key_end = end = size
+        else:
+            key_end = nl
+            end = nl + 1
+        if key_end > pos and mm[key_end - 1] == 0x0D:
+            key_end -= 1
+        yield pos, key_end, end
+        pos = end
 
-# Print duplicate counts
-if duplicates:
-    for line, count in duplicates.items():
-        print(f"{line:<40} {count} duplications.")
-else:
-    print("No duplicates found.")
-    exit()
 
-# Second pass: Write back only unique lines
-seen = set()
+def iter_blocks(mm, block_size=BUFFER_SIZE):
+    """Yield successive slices of the mapping of about block_size bytes that end on a line boundary"""
+    pos = 0
+    size = len(mm)
+    while pos < size:
+        end = min(pos + block_size, size)
+        if end < size:
+            nl = mm.rfind(b'\n', pos, end)
+            if nl == -1:
+                nl = mm.find(b'\n', end)
+            end = size if nl == -1 else nl + 1
+        yield mm[pos:end]
+        pos = end
 
-with open(file_path, 'r') as file, open("Receiving_Addresses_without_duplications.txt", 'w') as output_file:
-    for line in file:
-        stripped_line = line.strip()
-        if stripped_line not in seen:
-            output_file.write(line)
-            seen.add(stripped_line)
 
-# Print the total number of deleted duplicates
-print(f"\nDeleted {total_deleted} duplications in total.")
+def split_ranges(mm, parts):
+    """Split the mapping into up to `parts` byte ranges that start and end on line boundaries"""
+    size = len(mm)
+    bounds = [0]
+    for i in range(1, parts):
+        nl = mm.find(b'\n', max(size * i // parts, bounds[-1]))
+        if nl == -1 or nl + 1 >= size:
+            break
+        bounds.append(nl + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def fingerprint(key):
+    """Fixed 16-byte fingerprint of a line; 128 bits keeps collisions negligible at 1e9+ lines"""
+    return blake2b(key, digest_size=16).digest()
+
+
+def fadvise(file, advice, offset=0, length=0):
+    """Give the kernel a page-cache hint for a file; a no-op where posix_fadvise is unavailable"""
+    try:
+        os.posix_fadvise(file.fileno(), offset, length, getattr(os, advice))
+    except AttributeError:
+        pass
+
+
+@contextmanager
+def open_mapping(path, start=0, stop=None):
+    """Map a file read-only for a sequential scan of bytes [start, stop)
+
+    The scanned range is dropped from the page cache afterwards: it is never
+    re-read from cache, and keeping it would evict everything else on 70 GB inputs.
+    """
+    with open(path, 'rb') as file:
+        length = 0 if stop is None else stop - start
+        fadvise(file, 'POSIX_FADV_SEQUENTIAL', start, length)
+        mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            # Widen readahead and ask for huge pages to cut TLB misses on the long scan.
+            # madvise is Unix-only, and file-backed huge pages need kernel support
+            for advice in ('MADV_SEQUENTIAL', 'MADV_HUGEPAGE'):
+                try:
+                    mm.madvise(getattr(mmap, advice))
+                except (AttributeError, OSError):
+                    pass
+            yield mm
+        finally:
+            mm.close()
+            fadvise(file, 'POSIX_FADV_DONTNEED', start, length)
+
+
+def copy_range(in_file, mm, output_file, start, end):
+    """Append bytes [start, end) of the mapped input file to the output file
+
+    Uses os.copy_file_range where available so the bytes move kernel-to-kernel
+    without passing through Python, and falls back to writing the mapping slice.
+    """
+    if hasattr(os, 'copy_file_range'):
+        output_file.flush()
+        try:
+            while start < end:
+                copied = os.copy_file_range(in_file.fileno(), output_file.fileno(), end - start, start)
+                if not copied:
+                    break
+                start += copied
+        except OSError:
+            pass
+    if start < end:
+        output_file.write(mm[start:end])
+
+
+def dedup_in_memory(in_path, out_path):
+    """Write each line on first sight, returning {line: extra occurrences} for repeats"""
+    # `seen` holds fixed-size fingerprints so its size does not grow with line length
+    seen = set()
+    dup_counts = Counter()
+
+    with open_mapping(in_path) as mm, open(out_path, 'wb', buffering=BUFFER_SIZE) as output_file:
+        # Split whole blocks in C instead of locating every newline from Python
+        for block in iter_blocks(mm):
+            lines = block.split(b'\n')
+            ends_with_newline = not lines[-1]
+            if ends_with_newline:
+                lines.pop()
+
+            kept = []
+            last_kept = False
+            for line in lines:
+                key = line[:-1] if line.endswith(b'\r') else line
+                digest = fingerprint(key)
+                last_kept = digest not in seen
+                if last_kept:
+                    seen.add(digest)
+                    kept.append(line)
+                else:
+                    dup_counts[key] += 1
+
+            if len(kept) == len(lines):
+                # No duplicates in this block, so it can be written as is
+                output_file.write(block)
+            elif kept:
+                output_file.write(b'\n'.join(kept))
+                # Only the file's final line may lack a newline, and only if it was kept
+                if ends_with_newline or not last_kept:
+                    output_file.write(b'\n')
+
+    return dup_counts
+
+
+def _write_run(first_seen, temp_dir, run_name):
+    """Write one in-memory chunk as a sorted run of 'line<TAB>first offset<TAB>count' records"""
+    run_path = os.path.join(temp_dir, f"run_{run_name}.txt")
+    with open(run_path, 'wb', buffering=BUFFER_SIZE) as run_file:
+        run_file.writelines(b'%s\t%d\t%d\n' % (key, *first_seen[key]) for key in sorted(first_seen))
+    return run_path
+
+
+def _read_run(run_file):
+    """Yield (line, first offset, count) records from a sorted run"""
+    for record in run_file:
+        key, offset, count = record[:-1].rsplit(b'\t', 2)
+        yield key, int(offset), int(count)
+
+
+def _write_winners(offsets, temp_dir, run_num):
+    """Write the start offsets of kept lines as a sorted run, one number per line"""
+    run_path = os.path.join(temp_dir, f"winners_{run_num:06d}.txt")
+    offsets.sort()
+    with open(run_path, 'wb', buffering=BUFFER_SIZE) as run_file:
+        run_file.writelines(b'%d\n' % offset for offset in offsets)
+    return run_path
+
+
+def _build_runs(in_path, range_num, start, stop, chunk_size, run_dir):
+    """Build sorted runs for the lines in bytes [start, stop) of the input
+
+    Each line is tagged with its byte offset, which orders lines globally so
+    ranges can be processed independently by different workers.
+    """
+    runs = []
+    first_seen = {}
+    chunk_bytes = 0  # Memory held by the entries of first_seen, without its table
+
+    with open_mapping(in_path, start, stop) as mm:
+        for line_start, key_end, _ in iter_lines(mm, start, stop):
+            key = mm[line_start:key_end]
+            entry = first_seen.get(key)
+            if entry is None:
+                first_seen[key] = [line_start, 1]
+                chunk_bytes += len(key) + ENTRY_OVERHEAD
+            else:
+                entry[1] += 1
+                continue
+
+            if chunk_bytes + sys.getsizeof(first_seen) >= chunk_size:
+                runs.append(_write_run(first_seen, run_dir, f"{range_num:03d}_{len(runs):06d}"))
+                first_seen = {}
+                chunk_bytes = 0
+
+    if first_seen:
+        runs.append(_write_run(first_seen, run_dir, f"{range_num:03d}_{len(runs):06d}"))
+    return runs
+
+
+def dedup_external(in_path, out_path, mem_limit=MEMORY_LIMIT_GB * 2 ** 30, temp_dir=None, workers=WORKERS):
+    """Deduplicate a file that does not fit in RAM with a chunk sort + k-way merge
+
+    Lines are tagged with their byte offset so the first occurrence of each line
+    is kept in its original position. Returns {line: extra occurrences} for repeats.
+    """
+    # Every worker holds one chunk in memory, so they share the memory limit. The workers
+    # are capped so that each still gets MIN_CHUNK_SIZE within half of the limit,
+    # instead of raising the chunk size above the limit on machines with many cores
+    workers = max(1, min(workers, mem_limit // (2 * MIN_CHUNK_SIZE)))
+    chunk_size = min(max(mem_limit // 2 // workers, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+    max_winners = chunk_size // 64  # Offsets buffered before spilling a sorted run
+    dup_counts = Counter()
+
+    with tempfile.TemporaryDirectory(dir=temp_dir) as run_dir:
+        with open_mapping(in_path) as mm:
+            # Step 1: Build runs sorted by line, keeping each line's first offset and count.
+            # Byte ranges aligned to line boundaries are handled by parallel workers
+            ranges = split_ranges(mm, workers)
+            if len(ranges) > 1:
+                with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                    futures = [pool.submit(_build_runs, in_path, range_num, start, stop, chunk_size, run_dir)
+                               for range_num, (start, stop) in enumerate(ranges)]
+                    runs = [run for future in futures for run in future.result()]
+            else:
+                runs = _build_runs(in_path, 0, 0, len(mm), chunk_size, run_dir)
+
+            # Step 2: Merge the runs by (line, offset); the first record of each
+            # equal-line streak holds the offset of the occurrence to keep
+            winner_runs = []
+            winners = []
+            run_files = [open(run, 'rb', buffering=BUFFER_SIZE) for run in runs]
+            try:
+                current_key = None
+                current_count = 0
+                for key, offset, count in heapq.merge(*(_read_run(f) for f in run_files)):
+                    if key == current_key:
+                        current_count += count
+                        continue
+                    if current_count > 1:
+                        dup_counts[current_key] = current_count - 1
+                    winners.append(offset)
+                    if len(winners) >= max_winners:
+                        winner_runs.append(_write_winners(winners, run_dir, len(winner_runs)))
+                        winners = []
+                    current_key = key
+                    current_count = count
+                if current_count > 1:
+                    dup_counts[current_key] = current_count - 1
+            finally:
+                for run_file in run_files:
+                    run_file.close()
+
+            if winners:
+                winner_runs.append(_write_winners(winners, run_dir, len(winner_runs)))
+            del winners
+
+            # Step 3: Copy the kept lines out of the input in offset order. Adjacent kept
+            # lines are coalesced into one range so runs without duplicates cost one copy
+            winner_files = [open(run, 'rb', buffering=BUFFER_SIZE) for run in winner_runs]
+            try:
+                with open(in_path, 'rb') as in_file, open(out_path, 'wb', buffering=BUFFER_SIZE) as output_file:
+                    run_start = run_end = 0
+                    for offset in heapq.merge(*(map(int, f) for f in winner_files)):
+                        if offset != run_end or run_end - run_start >= BUFFER_SIZE:
+                            copy_range(in_file, mm, output_file, run_start, run_end)
+                            run_start = offset
+                        nl = mm.find(b'\n', offset)
+                        run_end = len(mm) if nl == -1 else nl + 1
+                    copy_range(in_file, mm, output_file, run_start, run_end)
+            finally:
+                for winner_file in winner_files:
+                    winner_file.close()
+
+    return dup_counts
+
+
+if __name__ == "__main__":
+    if os.path.getsize(file_path) == 0:
+        print("No duplicates found.")
+        sys.exit(0)
+
+    if os.path.getsize(file_path) > MEMORY_LIMIT_GB * 2 ** 30:
+        dup_counts = dedup_external(file_path, output_path)
+    else:
+        dup_counts = dedup_in_memory(file_path, output_path)
+
+    # Track the total number of duplicates deleted
+    total_deleted = sum(dup_counts.values())
+
+    # Print duplicate counts (add 1 for the kept first occurrence) without a print call per line
+    if dup_counts:
+        sys.stdout.writelines(f"{line.decode('utf-8', errors='replace'):<40} {count + 1} duplications.\n"
+                              for line, count in dup_counts.items())
+    else:
+        print("No duplicates found.")
+        sys.exit(0)
+
+    # Print the total number of deleted duplicates
+    print(f"\nDeleted {total_deleted} duplications in total.")
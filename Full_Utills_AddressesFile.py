@@ -8,15 +8,24 @@
 # Dependencies:  pip install colorama
 
 import os
+import io
 import sys
 import shutil
 import re
+import subprocess
 from datetime import datetime
 from tempfile import TemporaryDirectory, gettempdir
 import time
 from pathlib import Path
 import hashlib
 import mmap
+import glob
+from bisect import bisect_right
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from contextlib import nullcontext
 
 # Try to import colorama for better visibility, but don't require it
 try:
@@ -40,12 +49,22 @@ except ImportError:
     class Style:
         BRIGHT = DIM = NORMAL = RESET_ALL = ""
 
+
+# Tab completion of paths at the prompts where readline is available (not on Windows)
+try:
+    import readline
+except ImportError:
+    readline = None
+
 # ===== CONFIGURATION VARIABLES =====
 INPUT_FILE = r"C:\General\My Scripts and Programs\CryptoPare\Test\test_address.txt"  # Your main input file
 OUTPUT_FILE = r"C:\General\My Scripts and Programs\CryptoPare\Test\After_test_address.txt"  # Output file
 SECOND_FILE = ""  # Optional: Second file to merge (set to "" if not needed)
 TEMP_DIR = gettempdir()  # Windows temp directory
 MEMORY_LIMIT_GB = 16  # Memory limit in GB for sorting
+SORT_WORKERS = os.cpu_count() or 1  # Processes sorting chunks in parallel
+USE_SYSTEM_SORT = True  # Use GNU sort (coreutils, MSYS or Git for Windows) when it is on PATH
+COMPRESS_TEMP_FILES = True  # Let GNU sort zstd-compress its temp files when zstd is on PATH
 BUFFER_SIZE = 8 * 1024 * 1024  # 8MB buffer for file operations
 REMOVE_CHARACTERS = "#"  # Characters that will cause entire lines to be removed
 AUTO_VERIFY_SORTING = True  # Automatically check if output is sorted
@@ -53,9 +72,387 @@ AUTO_VERIFY_SORTING = True  # Automatically check if output is sorted
 
 # ====================================
 
+def iter_line_blocks(mm, block_size=BUFFER_SIZE, start=0, stop=None):
+    """Yield successive slices of mm[start:stop] of about block_size bytes that end on a line boundary"""
+    pos = start
+    size = len(mm) if stop is None else stop
+    while pos < size:
+        end = min(pos + block_size, size)
+        if end < size:
+            nl = mm.rfind(b'\n', pos, end)
+            if nl == -1:
+                nl = mm.find(b'\n', end)
+            end = size if nl == -1 else nl + 1
+        yield mm[pos:end]
+        pos = end
+
+
+def iter_file_blocks(filepath, block_size=BUFFER_SIZE, start=0, stop=None):
+    """Map a file and yield the line-aligned blocks of bytes [start, stop), yields nothing for an empty file"""
+    with open_sequential(filepath, start, 0 if stop is None else stop - start) as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            except AttributeError:
+                pass  # madvise is not available on Windows
+            yield from iter_line_blocks(mm, block_size, start, stop)
+
+
+def find_line_offset(filepath, line_num):
+    """Byte offset where line line_num (counting from 1) starts, or the file size if it has fewer lines
+
+    Newlines are counted per block in C, only the block holding the line is split further.
+    """
+    offset = 0
+    lines_before = 0
+    for block in iter_file_blocks(filepath):
+        newlines = block.count(b'\n')
+        if lines_before + newlines >= line_num - 1:
+            skip = line_num - 1 - lines_before
+            return offset + len(block) - len(block.split(b'\n', skip)[-1]) if skip else offset
+        lines_before += newlines
+        offset += len(block)
+    return offset
+
+
+def iter_line_ranges(filepath, range_size):
+    """Yield (start, end) byte ranges of about range_size bytes that end on a line boundary"""
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                nl = mm.find(b'\n', min(start + range_size, size) - 1)
+                end = size if nl == -1 else nl + 1
+                yield start, end
+                start = end
+
+
+@lru_cache(maxsize=None)
+def find_gnu_sort():
+    """Path of GNU sort if it is on PATH, else None (the Windows sort.exe has different options)"""
+    sort_path = shutil.which('sort')
+    if sort_path is None:
+        return None
+    try:
+        # A sort that does not take --version may read its input instead, which would block on the console
+        version = subprocess.run([sort_path, '--version'], stdin=subprocess.DEVNULL, capture_output=True,
+                                 text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return sort_path if 'GNU' in version else None
+
+
+@lru_cache(maxsize=None)
+def find_temp_compressor():
+    """Path of zstd if temp file compression is enabled and zstd is on PATH, else None"""
+    return shutil.which('zstd') if COMPRESS_TEMP_FILES else None
+
+
+def open_sequential(path, start=0, length=0):
+    """Open a file for a sequential binary read of bytes [start, start + length), 0 meaning to the end
+
+    Tells the OS to read ahead aggressively: O_SEQUENTIAL sets FILE_FLAG_SEQUENTIAL_SCAN
+    on Windows, posix_fadvise is used elsewhere. O_NOATIME skips the access time update
+    on Linux, which is only allowed for the file's owner.
+    """
+    flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_SEQUENTIAL', 0)
+    try:
+        fd = os.open(path, flags | getattr(os, 'O_NOATIME', 0))
+    except PermissionError:
+        fd = os.open(path, flags)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, start, length, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # Only a hint, some file systems and pipes reject it
+    return open(fd, 'rb')
+
+
+def sort_and_write_chunk(input_file, start, end, chunk_file, deduplicate=False, filter_pattern=None):
+    """Clean, sort and write the lines in bytes [start, end) of input_file to chunk_file
+
+    Runs in a worker process, which reads its own byte range so the chunk is never
+    copied between processes. Lines are trimmed, and empty lines and lines matching
+    filter_pattern skipped. Returns (lines kept, lines written).
+    """
+    with open_sequential(input_file, start, end - start) as f:
+        f.seek(start)
+        data = f.read(end - start)
+        if hasattr(os, 'posix_fadvise'):
+            # The range is not read again, keeping it cached would only evict other pages
+            os.posix_fadvise(f.fileno(), start, end - start, os.POSIX_FADV_DONTNEED)
+    lines = clean_block_lines(data, filter_pattern)
+    del data
+    lines_kept = len(lines)
+    if deduplicate:
+        # Duplicates inside the chunk never need to reach the merge
+        lines = list(set(lines))
+    lines.sort()
+    with open(chunk_file, 'wb', buffering=BUFFER_SIZE) as chunk_f:
+        if lines:
+            chunk_f.write(b'\n'.join(lines) + b'\n')
+    return lines_kept, len(lines)
+
+
+def clean_range(input_file, start, end, filter_pattern=None):
+    """Clean the lines in bytes [start, end) of input_file, returns (cleaned lines joined with newlines, line count)
+
+    Runs in a worker process, so the cleaning in front of GNU sort uses several cores.
+    """
+    with open_sequential(input_file, start, end - start) as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = clean_block_lines(data, filter_pattern)
+    del data
+    return (b'\n'.join(lines) + b'\n' if lines else b''), len(lines)
+
+
+def clean_block_lines(block, filter_pattern=None):
+    """Return the trimmed, non-empty lines of a block, leaving out lines that match filter_pattern"""
+    if filter_pattern is not None:
+        block, _ = drop_matching_lines(block, filter_pattern)
+    return [line for line in map(bytes.strip, block.split(b'\n')) if line]
+
+
+def write_sorted_lines(lines, output_file):
+    """Write a sorted list of lines to output_file, joining them in slices to bound the extra memory"""
+    with open(output_file, 'wb', buffering=BUFFER_SIZE) as out_f:
+        for i in range(0, len(lines), 65536):
+            out_f.write(b'\n'.join(lines[i:i + 65536]) + b'\n')
+
+
+def iter_run_blocks(run_file, block_size=BUFFER_SIZE // 4):
+    """Yield the lines of a sorted run file (without newlines) as one list per block read"""
+    tail = b''
+    while True:
+        block = run_file.read(block_size)
+        if not block:
+            break
+        lines = block.split(b'\n')
+        lines[0] = tail + lines[0]
+        tail = lines.pop()
+        if lines:
+            yield lines
+    if tail:
+        yield [tail]
+
+
+def merge_sorted_runs(run_files, deduplicate=True):
+    """k-way merge of sorted run files, yielding the merged lines in sorted batches
+
+    Each round takes every line up to the smallest last line of the current blocks (no
+    later line can sort before it) and merges them with one list.sort(), which finds
+    the sorted runs and merges them in C instead of line by line in Python.
+    """
+    sources = []
+    for run_file in run_files:
+        blocks = iter_run_blocks(run_file)
+        lines = next(blocks, None)
+        if lines:
+            sources.append([lines, 0, blocks])
+
+    last_line = None
+    while sources:
+        bound = min(lines[-1] for lines, _, _ in sources)
+        batch = []
+        for source in sources:
+            lines, pos, _ = source
+            end = bisect_right(lines, bound, pos)
+            batch += lines[pos:end]
+            source[1] = end
+
+        # Refill the sources whose block is used up and drop finished runs
+        active = []
+        for source in sources:
+            if source[1] == len(source[0]):
+                lines = next(source[2], None)
+                if lines is None:
+                    continue
+                source[0], source[1] = lines, 0
+            active.append(source)
+        sources = active
+
+        batch.sort()
+        if deduplicate:
+            # Equal lines are adjacent after the sort, keep the first of each group,
+            # including groups that continue from the previous batch
+            batch = list(dict.fromkeys(batch))
+            if batch[0] == last_line:
+                del batch[0]
+            if batch:
+                last_line = batch[-1]
+        yield batch
+
+
+def split_address_range(input_file, start, end, output_files):
+    """Route the lines in bytes [start, end) of input_file to output_files by address type
+
+    Runs in a worker process when a large file is split in parallel.
+    Returns {prefix: lines written}.
+    """
+    counters = {prefix: 0 for prefix in output_files}
+    file_handles = {prefix: open(filepath, 'wb', buffering=BUFFER_SIZE)
+                    for prefix, filepath in output_files.items()}
+
+    # Lines are routed by their first byte and collected per bucket, then written in batches.
+    # The routes are a 256-entry table indexed by the byte value, cheaper than a slice and a dict lookup
+    routes = tuple({ord('1'): '1', ord('3'): '3'}.get(byte) for byte in range(256))
+    block_routes = ((b'1', '1'), (b'3', '3'), (b'bc1', 'bc1'))
+    buckets = {prefix: [] for prefix in output_files}
+    batch_lines = 2048  # ~64 KB of addresses per write
+
+    def flush(prefix):
+        bucket = buckets[prefix]
+        file_handles[prefix].write(b''.join(bucket))
+        counters[prefix] += len(bucket)
+        bucket.clear()
+
+    try:
+        for block in iter_file_blocks(input_file, start=start, stop=end):
+            # Sorted input keeps each address type together, so most blocks hold a single
+            # type. Check that with C-level counts and write such a block as a whole
+            block_lines = block.count(b'\n') + (not block.endswith(b'\n'))
+            for marker, prefix in block_routes:
+                if block.startswith(marker) and block.count(b'\n' + marker) == block_lines - 1:
+                    flush(prefix)
+                    file_handles[prefix].write(block)
+                    counters[prefix] += block_lines
+                    break
+            else:
+                for line in io.BytesIO(block):
+                    # Determine where to write the address
+                    prefix = routes[line[0]]
+                    if prefix is None:
+                        address = line.lstrip()
+                        prefix = routes[address[0]] if address else 'other'
+                        if prefix is None:
+                            prefix = 'bc1' if address.startswith(b'bc1') else 'other'
+
+                    bucket = buckets[prefix]
+                    bucket.append(line)
+                    if len(bucket) >= batch_lines:
+                        flush(prefix)
+
+        for prefix in buckets:
+            flush(prefix)
+    finally:
+        for fh in file_handles.values():
+            fh.close()
+    return counters
+
+
+def compile_characters_pattern(characters):
+    """Compile a pattern that matches any of the characters in their UTF-8 encoding
+
+    A single character (the usual REMOVE_CHARACTERS) is returned as its encoded bytes,
+    which drop_matching_lines finds with bytes.find, several times faster than a regex.
+    """
+    encoded = [char.encode('utf-8') for char in dict.fromkeys(characters)]
+    if len(encoded) == 1:
+        return encoded[0]
+    # Single-byte characters go into one character class, which is faster than an alternation
+    single = b''.join(re.escape(char) for char in encoded if len(char) == 1)
+    alternatives = [re.escape(char) for char in encoded if len(char) > 1]
+    if single:
+        alternatives.append(b'[' + single + b']')
+    return re.compile(b'|'.join(alternatives))
+
+
+def drop_matching_lines(block, pattern):
+    """Remove the lines of a block that contain a match of pattern, returns (block, lines removed)
+
+    pattern is a compiled regex or a bytes string. Only the lines around a match are cut
+    out, so a block without any match is returned as is.
+    """
+    if isinstance(pattern, bytes):
+        def find(pos):
+            start = block.find(pattern, pos)
+            return (start, start + len(pattern)) if start != -1 else None
+    else:
+        def find(pos):
+            match = pattern.search(block, pos)
+            return match.span() if match else None
+
+    kept = []
+    kept_from = lines_removed = 0
+    match = find(0)
+    while match:
+        start = block.rfind(b'\n', 0, match[0]) + 1
+        end = block.find(b'\n', match[1]) + 1 or len(block)
+        kept.append(block[kept_from:start])
+        kept_from = end
+        lines_removed += 1
+        match = find(end)
+
+    if not lines_removed:
+        return block, 0
+    kept.append(block[kept_from:])
+    return b''.join(kept), lines_removed
+
+
+def iter_folder_files(folder_path):
+    """Yield (path, size) for every file under folder_path, top-down like os.walk
+
+    The sizes come from the os.scandir entries, which on Windows need no extra stat call.
+    """
+    subdirs = []
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.stat().st_size
+    except OSError:
+        return  # Unreadable folders are skipped, as os.walk does
+    for subdir in subdirs:
+        yield from iter_folder_files(subdir)
+
+
+def path_ends_with_newline(path):
+    """Return True if the file at path ends with a newline or is empty"""
+    with open(path, 'rb') as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def append_file(source_path, outfile):
+    """Append a whole file to a binary output file in large blocks
+
+    Uses os.sendfile where available so the data is copied inside the kernel, and
+    falls back to shutil.copyfileobj with a BUFFER_SIZE block (e.g. on Windows).
+    """
+    with open(source_path, 'rb') as infile:
+        if hasattr(os, 'sendfile'):
+            outfile.flush()
+            remaining = os.fstat(infile.fileno()).st_size
+            try:
+                while remaining > 0:
+                    sent = os.sendfile(outfile.fileno(), infile.fileno(), None, min(remaining, 1 << 30))
+                    if not sent:
+                        break
+                    remaining -= sent
+            except OSError:
+                pass
+            if remaining <= 0:
+                return
+            outfile.seek(0, os.SEEK_END)
+        shutil.copyfileobj(infile, outfile, length=BUFFER_SIZE)
+
+
 class FileStats:
     """Utility class for file statistics"""
 
+    # Line counts keyed by (path, mtime, size), so a file that has not changed is only scanned once
+    _line_counts = {}
+
     @staticmethod
     def get_file_size(filepath):
         """Get human-readable file size"""
@@ -76,25 +473,27 @@ class FileStats:
     @staticmethod
     def count_lines(filepath, show_progress=True):
         """Count lines in a file efficiently - Windows compatible"""
-        if not os.path.exists(filepath):
+        try:
+            stat = os.stat(filepath)
+        except OSError:
             return 0
 
+        cache_key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+        if cache_key in FileStats._line_counts:
+            return FileStats._line_counts[cache_key]
+
         if show_progress:
             print(f"{Fore.CYAN}Counting lines in {os.path.basename(filepath)}...")
 
         count = 0
-        # Use memory mapping for large files
+        # Use memory mapping for large files, counted in large blocks so the C-level
+        # count does the work instead of the Python loop
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                # Use mmap for large files
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                    while True:
-                        chunk = mm.read(1024 * 1024)  # 1MB chunks
-                        if not chunk:
-                            break
-                        count += chunk.count(b'\n')
-                        if show_progress and count % 10000000 == 0:
-                            print(f"  Counted {Fore.YELLOW}{count:,}{Style.RESET_ALL} lines...")
+            for block in iter_file_blocks(filepath, 64 * 1024 * 1024):  # 64MB blocks
+                previous = count
+                count += block.count(b'\n')
+                if show_progress and count // 10000000 != previous // 10000000:
+                    print(f"  Counted {Fore.YELLOW}{count:,}{Style.RESET_ALL} lines...")
         except:
             # Fallback for very large files or permission issues
             count = 0
@@ -103,6 +502,7 @@ class FileStats:
                     if show_progress and count % 10000000 == 0:
                         print(f"  Counted {Fore.YELLOW}{count:,}{Style.RESET_ALL} lines...")
 
+        FileStats._line_counts[cache_key] = count
         return count
 
 
@@ -120,22 +520,34 @@ class SortingChecker:
         previous_line = None
         lines_checked = 0
 
-        with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
-            for line_num, line in enumerate(f, 1):
-                if line_num > max_check_lines:
-                    break
+        # Lines are compared as bytes, the same order as their decoded UTF-8 text. Each block
+        # is checked at C level with sorted(), which is a single linear pass on sorted data
+        for block in iter_file_blocks(filepath):
+            lines = list(map(bytes.strip, block.split(b'\n')))
+            if block.endswith(b'\n'):
+                lines.pop()
+            del lines[max_check_lines - lines_checked:]
+            if not lines:
+                break
 
-                current_line = line.strip()
+            if previous_line is not None and lines[0] < previous_line:
+                unsorted_at = 0
+            elif lines != sorted(lines):
+                unsorted_at = next(i for i in range(1, len(lines)) if lines[i] < lines[i - 1])
+            else:
+                unsorted_at = None
 
-                if previous_line is not None and current_line < previous_line:
-                    print(f"{Fore.RED}File is NOT sorted (unsorted at line {line_num}){Style.RESET_ALL}")
-                    return False, line_num
+            if unsorted_at is not None:
+                line_num = lines_checked + unsorted_at + 1
+                print(f"{Fore.RED}File is NOT sorted (unsorted at line {line_num}){Style.RESET_ALL}")
+                return False, line_num
 
-                previous_line = current_line
-                lines_checked = line_num
+            previous_line = lines[-1]
+            previous = lines_checked
+            lines_checked += len(lines)
 
-                if line_num % 50000 == 0:
-                    print(f"  Checked {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines...")
+            if lines_checked // 1000000 != previous // 1000000:
+                print(f"  Checked {Fore.YELLOW}{lines_checked:,}{Style.RESET_ALL} lines...")
 
         if lines_checked > 0:
             print(f"{Fore.GREEN}✓ File appears to be sorted (checked {lines_checked:,} lines){Style.RESET_ALL}")
@@ -148,152 +560,371 @@ class SortingChecker:
 class ExternalSorter:
     """External merge sort implementation for Windows"""
 
-    def __init__(self, temp_dir, memory_limit_gb=4):
+    def __init__(self, temp_dir, memory_limit_gb=4, workers=SORT_WORKERS, use_system_sort=USE_SYSTEM_SORT):
         self.temp_dir = temp_dir
         self.memory_limit_bytes = memory_limit_gb * 1024 * 1024 * 1024
-        self.chunk_size = self.memory_limit_bytes // 2  # Use half of memory for chunks
+        self.workers = max(1, workers)
+        self.use_system_sort = use_system_sort
+        # Merge fan-in: each open chunk holds about BUFFER_SIZE of lines, keep them to a quarter of memory
+        self.k = max(2, int(self.memory_limit_bytes // (BUFFER_SIZE * 4)))
+        # Use half of the memory left after the merge buffers for chunks (Python strings need the rest).
+        # It is shared by the workers, each sorting one chunk
+        self.chunk_size = max(BUFFER_SIZE,
+                              int(self.memory_limit_bytes - self.k * BUFFER_SIZE) // 2 // self.workers)
         self.checker = SortingChecker()
 
         # Create temp directory if it doesn't exist
         os.makedirs(self.temp_dir, exist_ok=True)
 
-    def external_sort(self, input_file, output_file, deduplicate=True, auto_verify=True):
-        """External merge sort implementation with optional verification"""
+    def external_sort(self, input_file, output_file, deduplicate=True, auto_verify=True, cleaned_input=False,
+                      filter_characters=None):
+        """External merge sort implementation with optional verification
+
+        input_file can also be a list of files, which are sorted together. Lines are trimmed
+        and empty lines (and lines containing any of filter_characters) skipped on the way
+        into the sort, so the input does not need a separate cleaning pass. cleaned_input
+        means that was already done and lets GNU sort read the files directly.
+        Returns the number of lines sorted, or None if an existing sorted output file was kept.
+        """
         print(f"{Fore.CYAN}Starting external sort...")
+        input_files = [input_file] if isinstance(input_file, (str, os.PathLike)) else list(input_file)
+        filter_pattern = compile_characters_pattern(filter_characters) if filter_characters else None
 
         # First check if output file already exists and is sorted
         if os.path.exists(output_file) and auto_verify:
             is_sorted, _ = self.checker.is_file_sorted(output_file)
             if is_sorted:
                 print(f"{Fore.GREEN}Output file already exists and is sorted. Skipping sort.{Style.RESET_ALL}")
-                return True
-
-        # Step 1: Split into sorted chunks
-        chunks = self._create_sorted_chunks(input_file)
+                return None
 
-        # Step 2: Merge chunks
-        self._merge_chunks(chunks, output_file, deduplicate)
+        # Inputs that are already clean and sorted only need merging, or just concatenating
+        # when their line ranges do not overlap, instead of a full sort
+        lines_sorted = None if filter_pattern else self._merge_presorted(input_files, output_file, deduplicate)
+        if lines_sorted is None:
+            lines_sorted = self._system_sort(input_files, output_file, deduplicate,
+                                             cleaned_input and not filter_pattern, filter_pattern)
+        if lines_sorted is None:
+            chunks = []
+            lines_sorted = 0
+            sources = [(path, 0) for path in input_files]
+            if deduplicate:
+                # Collect the unique lines in a set first: when they fit in memory, the input
+                # is deduplicated in one pass without writing chunks or merging them
+                unique_lines, sources, lines_sorted = self._collect_unique_lines(sources, filter_pattern)
+                target_file = os.path.join(self.temp_dir, "chunk_unique.txt") if sources else output_file
+                write_sorted_lines(sorted(unique_lines), target_file)
+                del unique_lines
+                if sources:
+                    chunks.append(target_file)
+
+            if sources or not deduplicate:
+                # Step 1: Split the rest of the input into sorted chunks
+                more_chunks, more_lines = self._create_sorted_chunks(sources, deduplicate, filter_pattern)
+                chunks += more_chunks
+                lines_sorted += more_lines
+
+                # Step 2: Merge chunks
+                self._merge_chunks(chunks, output_file, deduplicate)
+
+            # Cleanup temporary chunks
+            for chunk_file in chunks:
+                try:
+                    os.remove(chunk_file)
+                except:
+                    pass
 
         # Step 3: Auto-verify if requested
         if auto_verify:
             self._auto_verify_sorting(output_file)
 
-        # Cleanup temporary chunks
-        for chunk_file in chunks:
-            try:
-                os.remove(chunk_file)
-            except:
-                pass
-
-        return True
+        return lines_sorted
 
-    def _create_sorted_chunks(self, input_file):
-        """Split large file into sorted chunks that fit in memory"""
-        chunks = []
-        chunk_num = 0
+    def _merge_presorted(self, input_files, output_file, deduplicate=True):
+        """Merge input files that are already clean and sorted
 
-        print(f"{Fore.CYAN}Step 1: Creating sorted chunks...")
-
-        with open(input_file, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
-            while True:
-                # Read a chunk that fits in memory
-                lines = []
-                current_size = 0
+        Returns the number of lines merged, or None if any input needs a full sort.
+        """
+        print(f"{Fore.CYAN}Checking if the input is already sorted...{Style.RESET_ALL}")
+        # Check the opening block of every file first, so unsorted input is rejected before any full scan
+        if any(self._scan_sorted_file(path, max_blocks=1) is None for path in input_files):
+            return None
+        ranges = []
+        for path in input_files:
+            info = self._scan_sorted_file(path)
+            if info is None:
+                return None
+            if info[2]:
+                ranges.append((info[0], info[1], info[2], info[3], path))
+
+        lines_merged = sum(lines for _, _, lines, _, _ in ranges)
+        ranges.sort()
+        if all(previous[1] < current[0] for previous, current in zip(ranges, ranges[1:])) and \
+                (not deduplicate or all(unique for _, _, _, unique, _ in ranges)):
+            # No two files overlap, so in order of their first line they form the sorted output
+            print(f"{Fore.GREEN}Input files are sorted and do not overlap, concatenating them...{Style.RESET_ALL}")
+            with open(output_file, 'wb') as outfile:
+                for *_, path in ranges:
+                    append_file(path, outfile)
+                    if not path_ends_with_newline(path):
+                        outfile.write(b'\n')
+            return lines_merged
+
+        print(f"{Fore.GREEN}Input files are sorted, merging them without a full sort...{Style.RESET_ALL}")
+        paths = [path for *_, path in ranges]
+        if self._system_sort(paths, output_file, deduplicate, cleaned_input=True, merge_only=True) is None:
+            self._merge_chunks(paths, output_file, deduplicate, keep_inputs=True)
+        return lines_merged
 
-                while current_size < self.chunk_size:
-                    line = f.readline()
-                    if not line:
-                        break
+    @staticmethod
+    def _scan_sorted_file(path, max_blocks=None):
+        """Check that a file is sorted with no empty or padded lines, max_blocks stops after that many blocks
+
+        Returns (first line, last line, line count, no repeated lines) for the blocks checked, or None
+        as soon as a line breaks the order, so unsorted input costs about one block read.
+        """
+        first_line = last_line = None
+        line_count = 0
+        unique = True
+        for block in islice(iter_file_blocks(path), max_blocks):
+            lines = block.split(b'\n')
+            if block.endswith(b'\n'):
+                lines.pop()
+            # Both checks run in C: a line equal to its stripped copy has no padding or \r
+            if not all(lines) or list(map(bytes.strip, lines)) != lines or lines != sorted(lines):
+                return None
+            if last_line is not None:
+                if lines[0] < last_line:
+                    return None
+                unique = unique and lines[0] != last_line
+            if first_line is None:
+                first_line = lines[0]
+            unique = unique and len(set(lines)) == len(lines)
+            last_line = lines[-1]
+            line_count += len(lines)
+        return first_line, last_line, line_count, unique
+
+    def _system_sort(self, input_files, output_file, deduplicate=True, cleaned_input=False, filter_pattern=None,
+                     merge_only=False):
+        """Sort with GNU sort if it is available, merge_only merges input files that are already sorted
+
+        Returns the number of lines sorted, or None if the Python sort has to be used.
+        """
+        sort_path = find_gnu_sort() if self.use_system_sort else None
+        if sort_path is None:
+            return None
 
-                    line = line.strip()
-                    if line:  # Skip empty lines
-                        lines.append(line)
-                        current_size += len(line.encode('utf-8'))
+        print(f"{Fore.CYAN}Sorting with {sort_path}...")
+        command = [sort_path, '-S', f"{max(1, int(self.memory_limit_bytes) // (1024 * 1024))}M",
+                   f"--parallel={self.workers}", '-T', self.temp_dir, '-o', output_file]
+        if deduplicate:
+            command.append('-u')
+        if merge_only:
+            command.append('-m')
+        compressor = find_temp_compressor()
+        if compressor:
+            # Sorted temp runs compress several times over, trading a little CPU for temp disk I/O
+            command.append(f"--compress-program={compressor}")
+        # LC_ALL=C compares raw bytes, the same order as the Python sort
+        env = dict(os.environ, LC_ALL='C')
 
-                if not lines:
-                    break
+        try:
+            if cleaned_input:
+                subprocess.run(command + ['--'] + input_files, check=True, env=env)
+                return sum(FileStats.count_lines(path, show_progress=False) for path in input_files)
+
+            # Clean the lines on their way into sort's stdin instead of writing a cleaned copy first
+            lines_sorted = 0
+            with subprocess.Popen(command, stdin=subprocess.PIPE, env=env) as process:
+                for data, line_count in self._iter_cleaned_blocks(input_files, filter_pattern):
+                    process.stdin.write(data)
+                    lines_sorted += line_count
+                process.stdin.close()
+            if process.returncode:
+                raise subprocess.CalledProcessError(process.returncode, command)
+            return lines_sorted
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"{Fore.YELLOW}System sort failed ({e}), using the Python sort instead{Style.RESET_ALL}")
+            return None
 
-                # Sort the chunk
-                lines.sort()
+    def _iter_cleaned_blocks(self, input_files, filter_pattern=None):
+        """Yield (cleaned lines joined with newlines, line count) for the input files, in input order
+
+        With several workers, line-aligned ranges are cleaned in worker processes, at most
+        two per worker in flight to bound memory use.
+        """
+        if self.workers == 1:
+            for path in input_files:
+                for block in iter_file_blocks(path):
+                    lines = clean_block_lines(block, filter_pattern)
+                    if lines:
+                        yield b'\n'.join(lines) + b'\n', len(lines)
+            return
 
-                # Write chunk to temp file
-                chunk_file = os.path.join(self.temp_dir, f"chunk_{chunk_num:06d}.txt")
-                with open(chunk_file, 'w', encoding='utf-8') as chunk_f:
-                    for line in lines:
-                        chunk_f.write(line + '\n')
+        pending = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for path in input_files:
+                for start, end in iter_line_ranges(path, BUFFER_SIZE * 4):
+                    if len(pending) >= self.workers * 2:
+                        yield pending.pop(0).result()
+                    pending.append(pool.submit(clean_range, path, start, end, filter_pattern))
+            while pending:
+                yield pending.pop(0).result()
+
+    def _collect_unique_lines(self, sources, filter_pattern=None):
+        """Collect the unique cleaned lines of the (file, start offset) sources in a set while they fit in memory
+
+        Returns (unique lines, sources left, lines read). The sources left are empty when the
+        whole input was read, else they start after the block where the set outgrew its share
+        of the memory limit.
+        """
+        print(f"{Fore.CYAN}Step 1: Collecting unique lines in memory...")
+        unique_lines = set()
+        unique_bytes = 0  # Estimated size of the line objects in the set
+        budget = self.memory_limit_bytes * 0.6
+        lines_read = 0
+
+        for i, (path, start) in enumerate(sources):
+            pos = start
+            for block in iter_file_blocks(path, start=start):
+                lines = clean_block_lines(block, filter_pattern)
+                pos += len(block)
+                lines_read += len(lines)
+                before = len(unique_lines)
+                unique_lines.update(lines)
+                if lines:
+                    # A bytes object takes about 33 bytes plus its data
+                    unique_bytes += (len(unique_lines) - before) * (33 + len(block) // len(lines))
+                if sys.getsizeof(unique_lines) + unique_bytes > budget:
+                    print(f"  {Fore.YELLOW}Unique lines do not fit in memory, "
+                          f"continuing with sorted chunks{Style.RESET_ALL}")
+                    print(f"  Collected {Fore.GREEN}{len(unique_lines):,}{Style.RESET_ALL} unique lines "
+                          f"from {Fore.YELLOW}{lines_read:,}{Style.RESET_ALL} lines")
+                    return unique_lines, [(path, pos)] + sources[i + 1:], lines_read
+
+        print(f"  Collected {Fore.GREEN}{len(unique_lines):,}{Style.RESET_ALL} unique lines "
+              f"from {Fore.YELLOW}{lines_read:,}{Style.RESET_ALL} lines")
+        return unique_lines, [], lines_read
+
+    def _create_sorted_chunks(self, sources, deduplicate=False, filter_pattern=None):
+        """Split (file, start offset) sources into sorted chunks that fit in memory, returns (chunks, lines sorted)"""
+        chunks = []
+        chunk_num = 0
+        lines_sorted = 0
 
-                chunks.append(chunk_file)
-                chunk_num += 1
+        print(f"{Fore.CYAN}Step 1: Creating sorted chunks...")
 
-                print(
-                    f"  Created chunk {Fore.YELLOW}{chunk_num}{Style.RESET_ALL} with {Fore.GREEN}{len(lines):,}{Style.RESET_ALL} lines")
+        def wait_for_chunk(pending):
+            # Progress is measured in input bytes, which the chunk boundaries give for free
+            num, done, future = pending.pop(0)
+            lines_kept, lines_written = future.result()
+            elapsed = max(time.perf_counter() - start_time, 1e-9)
+            print(
+                f"  Created chunk {Fore.YELLOW}{num}{Style.RESET_ALL} with {Fore.GREEN}{lines_written:,}{Style.RESET_ALL} lines "
+                f"({done / max(total, 1) * 100:.1f}% of input, {done / elapsed / (1024 * 1024):,.1f} MB/s)")
+            return lines_kept
+
+        # The main process only finds chunk boundaries; reading, cleaning, sorting and
+        # writing each chunk happen in worker processes. At most one chunk per worker is
+        # in flight to bound memory use. Chunks never span two files.
+        # Lines are kept as bytes: they sort with memcmp, in the same order as their
+        # decoded text for UTF-8, and are written back without re-encoding
+        pending = []
+        total = sum(os.path.getsize(path) - start for path, start in sources)
+        done = 0
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for input_file, start in sources:
+                with open(input_file, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else nullcontext(b'') as mm:
+                        while start < size:
+                            # A chunk that fits in memory, extended to the end of its last line
+                            nl = mm.find(b'\n', min(start + self.chunk_size, size) - 1)
+                            end = size if nl == -1 else nl + 1
+
+                            chunk_file = os.path.join(self.temp_dir, f"chunk_{chunk_num:06d}.txt")
+                            if len(pending) >= self.workers:
+                                lines_sorted += wait_for_chunk(pending)
+                            chunk_num += 1
+                            done += end - start
+                            pending.append((chunk_num, done, pool.submit(sort_and_write_chunk, input_file, start, end,
+                                                                         chunk_file, deduplicate, filter_pattern)))
+                            chunks.append(chunk_file)
+                            start = end
+
+            while pending:
+                lines_sorted += wait_for_chunk(pending)
 
         print(f"Created {Fore.GREEN}{len(chunks)}{Style.RESET_ALL} chunks")
-        return chunks
+        return chunks, lines_sorted
 
-    def _merge_chunks(self, chunks, output_file, deduplicate=True):
-        """Merge sorted chunks into final file"""
+    def _merge_chunks(self, chunks, output_file, deduplicate=True, keep_inputs=False):
+        """Merge sorted chunks into final file, keep_inputs leaves the given chunk files in place"""
         print(f"{Fore.CYAN}Step 2: Merging chunks...")
 
         if not chunks:
             return
 
-        # Open all chunk files
-        chunk_files = []
-        current_lines = []
-
-        for chunk_file in chunks:
-            try:
-                f = open(chunk_file, 'r', encoding='utf-8', buffering=BUFFER_SIZE)
-                chunk_files.append(f)
-                line = f.readline().strip()
-                if line:
-                    current_lines.append(line)
-                else:
-                    current_lines.append(None)
-            except:
-                current_lines.append(None)
-
-        # Merge using heap algorithm
-        with open(output_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as out_f:
-            last_line = None
-            lines_written = 0
+        # Cascade: while there are more chunks than can be merged at once, merge them
+        # k at a time into intermediate runs
+        pass_num = 0
+        while len(chunks) > self.k:
+            pass_num += 1
+            print(f"  Merge pass {pass_num}: {Fore.YELLOW}{len(chunks)}{Style.RESET_ALL} chunks, "
+                  f"merging {self.k} at a time...")
+
+            runs = []
+            for i in range(0, len(chunks), self.k):
+                group = chunks[i:i + self.k]
+                run_file = os.path.join(self.temp_dir, f"run_{pass_num:02d}_{len(runs):06d}.txt")
+                self._merge_files(group, run_file, deduplicate, show_progress=False)
+                runs.append(run_file)
+
+                # Delete consumed chunks as soon as possible to free temp space
+                for chunk_file in group if pass_num > 1 or not keep_inputs else ():
+                    try:
+                        os.remove(chunk_file)
+                    except OSError:
+                        pass
+
+            chunks = runs
+
+        lines_written = self._merge_files(chunks, output_file, deduplicate)
+
+        # Intermediate runs are not tracked by the caller, remove them here
+        if pass_num:
+            for run_file in chunks:
+                try:
+                    os.remove(run_file)
+                except OSError:
+                    pass
 
-            while True:
-                # Find the smallest line
-                min_line = None
-                min_index = -1
+        print(f"Merge complete. Total lines written: {Fore.GREEN}{lines_written:,}{Style.RESET_ALL}")
 
-                for i, line in enumerate(current_lines):
-                    if line is not None:
-                        if min_line is None or line < min_line:
-                            min_line = line
-                            min_index = i
+    def _merge_files(self, chunks, output_file, deduplicate=True, show_progress=True):
+        """k-way merge of sorted files into output_file, returns the number of lines written"""
+        # Open all chunk files, they are read in blocks by merge_sorted_runs
+        chunk_files = [open_sequential(chunk_file) for chunk_file in chunks]
+        lines_written = 0
 
-                if min_line is None:
-                    break
+        try:
+            with open(output_file, 'wb', buffering=BUFFER_SIZE) as out_f:
+                for batch in merge_sorted_runs(chunk_files, deduplicate):
+                    if not batch:
+                        continue
 
-                # Write line if it's not a duplicate
-                if not deduplicate or min_line != last_line:
-                    out_f.write(min_line + '\n')
-                    last_line = min_line
-                    lines_written += 1
+                    out_f.write(b'\n'.join(batch) + b'\n')
+                    previous = lines_written
+                    lines_written += len(batch)
 
-                    if lines_written % 1000000 == 0:
+                    if show_progress and lines_written // 1000000 != previous // 1000000:
                         print(f"  Merged {Fore.YELLOW}{lines_written:,}{Style.RESET_ALL} lines...")
+        finally:
+            # Close all chunk files
+            for f in chunk_files:
+                f.close()
 
-                # Read next line from the chunk we just used
-                next_line = chunk_files[min_index].readline()
-                if next_line:
-                    current_lines[min_index] = next_line.strip()
-                else:
-                    current_lines[min_index] = None
-
-        # Close all chunk files
-        for f in chunk_files:
-            f.close()
-
-        print(f"Merge complete. Total lines written: {Fore.GREEN}{lines_written:,}{Style.RESET_ALL}")
+        return lines_written
 
     def _auto_verify_sorting(self, output_file):
         """Automatically verify sorting and re-sort if needed"""
@@ -308,7 +939,7 @@ class ExternalSorter:
             temp_output = output_file + ".temp"
 
             # Re-sort the file
-            self.external_sort(output_file, temp_output, deduplicate=False, auto_verify=False)
+            self.external_sort(output_file, temp_output, deduplicate=False, auto_verify=False, cleaned_input=True)
 
             # Replace the original file with the sorted one
             try:
@@ -331,24 +962,21 @@ class ExternalSorter:
 class BitcoinAddressProcessor:
     """Processor for Bitcoin address operations"""
 
+    # Basic Bitcoin address patterns, compiled once into a single alternation
+    ADDRESS_PATTERN = re.compile(
+        r'^(?:'
+        r'[13][a-km-zA-HJ-NP-Z1-9]{25,34}'  # Legacy addresses (P2PKH and P2SH)
+        r'|bc1p?[ac-hj-np-z02-9]{11,71}'  # Native SegWit (Bech32) and Taproot (Bech32m)
+        r'|[23][0-9A-Za-z]{25,34}'  # P2SH addresses starting with 2 or 3
+        r')$'
+    )
+    # The same patterns for one line of a multi-line text, capturing the address without spaces
+    ADDRESS_LINE_PATTERN = re.compile(r'^[^\S\n]*(' + ADDRESS_PATTERN.pattern[1:-1] + r')[^\S\n]*$', re.MULTILINE)
+
     @staticmethod
     def is_valid_bitcoin_address(address):
         """Check if a string looks like a Bitcoin address"""
-        address = address.strip()
-
-        # Basic Bitcoin address patterns
-        patterns = [
-            r'^[13][a-km-zA-HJ-NP-Z1-9]{25,34}$',  # Legacy addresses (P2PKH and P2SH)
-            r'^bc1[ac-hj-np-z02-9]{11,71}$',  # Native SegWit (Bech32)
-            r'^bc1p[ac-hj-np-z02-9]{11,71}$',  # Taproot (Bech32m)
-            r'^2[0-9A-Za-z]{25,34}$',  # P2SH addresses starting with 2 or 3
-            r'^3[0-9A-Za-z]{25,34}$',
-        ]
-
-        for pattern in patterns:
-            if re.match(pattern, address):
-                return True
-        return False
+        return BitcoinAddressProcessor.ADDRESS_PATTERN.match(address.strip()) is not None
 
     @staticmethod
     def get_address_type(address):
@@ -406,52 +1034,63 @@ class BitcoinAddressProcessor:
         print("\nStarting to split addresses...")
         start_time = datetime.now()
 
-        # Open all output files
-        file_handles = {}
-        for prefix, filepath in output_files.items():
-            file_handles[prefix] = open(filepath, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+        # Every line is routed on its own, so the file is cut into line-aligned
+        # byte ranges that are split by worker processes, each into its own part files.
+        # The parts are then appended to the output files in range order
+        size = os.path.getsize(input_file)
+        range_size = min(max(size // SORT_WORKERS + 1, 64 * 1024 * 1024), 1024 * 1024 * 1024)
+        ranges = list(iter_line_ranges(input_file, range_size))
+        part_files = []
 
         try:
-            with open(input_file, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
-                for line_num, line in enumerate(f, 1):
-                    address = line.strip()
-
-                    # Determine where to write the address
-                    if address.startswith('1'):
-                        file_handles['1'].write(line)
-                        counters['1'] += 1
-                    elif address.startswith('3'):
-                        file_handles['3'].write(line)
-                        counters['3'] += 1
-                    elif address.startswith('bc1'):
-                        file_handles['bc1'].write(line)
-                        counters['bc1'] += 1
-                    else:
-                        file_handles['other'].write(line)
-                        counters['other'] += 1
-
-                    total_lines += 1
-
-                    # Progress reporting
-                    if line_num % 1000000 == 0:
+            if len(ranges) <= 1:
+                counters = split_address_range(input_file, 0, size, output_files)
+            else:
+                print(f"Splitting {Fore.YELLOW}{len(ranges)}{Style.RESET_ALL} ranges with "
+                      f"{Fore.YELLOW}{SORT_WORKERS}{Style.RESET_ALL} workers...")
+                with ProcessPoolExecutor(max_workers=SORT_WORKERS) as pool:
+                    futures = []
+                    for num, (start, end) in enumerate(ranges):
+                        parts = {prefix: f"{filepath}.part{num:04d}" for prefix, filepath in output_files.items()}
+                        part_files.append(parts)
+                        futures.append(pool.submit(split_address_range, input_file, start, end, parts))
+
+                    for num, future in enumerate(futures, 1):
+                        for prefix, count in future.result().items():
+                            counters[prefix] += count
+
+                        # Progress reporting
+                        line_num = sum(counters.values())
                         elapsed = datetime.now() - start_time
-                        rate = line_num / elapsed.total_seconds()
-                        print(f"  Processed {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines ({rate:,.0f} lines/sec)")
+                        rate = line_num / max(elapsed.total_seconds(), 1e-9)
+                        print(f"  Range {num}/{len(ranges)}: processed {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} "
+                              f"lines ({rate:,.0f} lines/sec)")
                         print(f"    Addresses starting with '1': {Fore.GREEN}{counters['1']:,}{Style.RESET_ALL}")
                         print(f"    Addresses starting with '3': {Fore.GREEN}{counters['3']:,}{Style.RESET_ALL}")
                         print(f"    Addresses starting with 'bc1': {Fore.GREEN}{counters['bc1']:,}{Style.RESET_ALL}")
                         print(f"    Other addresses: {Fore.GREEN}{counters['other']:,}{Style.RESET_ALL}")
 
+                print("Joining split parts...")
+                for prefix, filepath in output_files.items():
+                    with open(filepath, 'wb') as outfile:
+                        for parts in part_files:
+                            append_file(parts[prefix], outfile)
+                            # Free each part's space as soon as it is copied, so the join
+                            # needs no more disk than the outputs themselves
+                            os.remove(parts[prefix])
+
+            total_lines = sum(counters.values())
+
         except Exception as e:
             print(f"{Fore.RED}Error during processing: {e}{Style.RESET_ALL}")
         finally:
-            # Close all file handles
-            for fh in file_handles.values():
-                try:
-                    fh.close()
-                except:
-                    pass
-
+            # Remove the part files an error left behind
+            for parts in part_files:
+                for part_file in parts.values():
+                    try:
+                        os.remove(part_file)
+                    except OSError:
+                        pass
         end_time = datetime.now()
         duration = end_time - start_time
 
@@ -485,16 +1124,19 @@ class LargeFileProcessor:
     """Main processor for large file operations - Windows compatible"""
 
     def __init__(self, temp_dir=TEMP_DIR, memory_limit_gb=MEMORY_LIMIT_GB):
-        self.temp_dir = temp_dir
+        # Create temp directory if it doesn't exist
+        os.makedirs(temp_dir, exist_ok=True)
+
+        # Work files go into a private subdirectory that is removed as a whole when the
+        # program exits, so chunks left by an error or Ctrl+C do not pile up in temp_dir
+        self._temp_dir = TemporaryDirectory(prefix="dedup_", dir=temp_dir)
+        self.temp_dir = self._temp_dir.name
         self.memory_limit_gb = memory_limit_gb
-        self.sorter = ExternalSorter(temp_dir, memory_limit_gb)
+        self.sorter = ExternalSorter(self.temp_dir, memory_limit_gb)
         self.checker = SortingChecker()
         self.remove_characters = REMOVE_CHARACTERS
         self.auto_verify = AUTO_VERIFY_SORTING
 
-        # Create temp directory if it doesn't exist
-        os.makedirs(self.temp_dir, exist_ok=True)
-
     def remove_lines_with_characters(self, input_file, output_file=None, characters=None):
         """Remove entire lines that contain specific characters"""
         print("\n" + "=" * 60)
@@ -517,11 +1159,11 @@ class LargeFileProcessor:
             characters = '#'
 
         # Get initial statistics
-        initial_size = FileStats.get_file_size(input_file)
+        initial_bytes = os.path.getsize(input_file)
         initial_lines = FileStats.count_lines(input_file)
 
         print(f"\nInput File: {Fore.YELLOW}{input_file}{Style.RESET_ALL}")
-        print(f"Initial size: {Fore.GREEN}{initial_size}{Style.RESET_ALL}")
+        print(f"Initial size: {Fore.GREEN}{FileStats._humanize_size(initial_bytes)}{Style.RESET_ALL}")
         print(f"Initial lines: {Fore.GREEN}{initial_lines:,}{Style.RESET_ALL}")
         print(f"Removing lines containing any of these characters: {Fore.RED}{characters}{Style.RESET_ALL}")
 
@@ -535,19 +1177,21 @@ class LargeFileProcessor:
         lines_removed = 0
         lines_kept = 0
 
-        with open(input_file, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as infile, \
-                open(output_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
-
-            for line_num, line in enumerate(infile, 1):
-                # Check if line contains any of the characters to remove
-                if any(char in line for char in characters):
-                    lines_removed += 1
-                else:
-                    outfile.write(line)
-                    lines_kept += 1
+        # Whole blocks are searched for the characters in C instead of testing every line
+        pattern = compile_characters_pattern(characters)
+        with open(output_file, 'wb', buffering=BUFFER_SIZE) as outfile:
+            line_num = 0
+            for block in iter_file_blocks(input_file):
+                block_lines = block.count(b'\n') + (not block.endswith(b'\n'))
+                block, removed = drop_matching_lines(block, pattern)
+                outfile.write(block)
+                lines_removed += removed
+                lines_kept += block_lines - removed
 
                 # Progress reporting
-                if line_num % 1000000 == 0:
+                previous = line_num
+                line_num += block_lines
+                if line_num // 1000000 != previous // 1000000:
                     elapsed = datetime.now() - start_time
                     rate = line_num / elapsed.total_seconds()
                     print(f"  Processed {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines "
@@ -557,7 +1201,7 @@ class LargeFileProcessor:
 
         end_time = datetime.now()
         duration = end_time - start_time
-        final_size = FileStats.get_file_size(output_file)
+        final_bytes = os.path.getsize(output_file)
 
         # Print summary
         print("\n" + "=" * 60)
@@ -569,10 +1213,9 @@ class LargeFileProcessor:
         print(f"Lines kept: {Fore.GREEN}{lines_kept:,}{Style.RESET_ALL}")
         print(f"Lines removed: {Fore.RED}{lines_removed:,}{Style.RESET_ALL}")
         print(f"Removal rate: {Fore.CYAN}{(lines_removed / initial_lines * 100):.2f}%{Style.RESET_ALL}")
-        print(f"\nInitial size: {initial_size}")
-        print(f"Final size: {final_size}")
-        print(
-            f"Size reduction: {Fore.GREEN}{(1 - os.path.getsize(output_file) / os.path.getsize(input_file)) * 100:.2f}%{Style.RESET_ALL}")
+        print(f"\nInitial size: {FileStats._humanize_size(initial_bytes)}")
+        print(f"Final size: {FileStats._humanize_size(final_bytes)}")
+        print(f"Size reduction: {Fore.GREEN}{(1 - final_bytes / initial_bytes) * 100:.2f}%{Style.RESET_ALL}")
         print(f"\nTime taken: {duration}")
         print(
             f"Processing speed: {Fore.CYAN}{initial_lines / duration.total_seconds():,.0f}{Style.RESET_ALL} lines/sec")
@@ -622,31 +1265,14 @@ class LargeFileProcessor:
 
         start_time = datetime.now()
 
-        # Step 1: Clean and concatenate files
-        cleaned_files = []
-        print(f"{Fore.CYAN}Step 1/{len(valid_files) + 2}: Cleaning files...{Style.RESET_ALL}")
-
-        for i, file_path in enumerate(valid_files, 1):
-            cleaned_file = os.path.join(self.temp_dir, f"cleaned_{i:04d}.txt")
-            self._clean_file(file_path, cleaned_file)
-            cleaned_lines = FileStats.count_lines(cleaned_file, show_progress=False)
-            print(f"  Cleaned file {i}: {Fore.GREEN}{cleaned_lines:,}{Style.RESET_ALL} lines")
-            cleaned_files.append(cleaned_file)
-
-        # Step 2: Concatenate cleaned files
-        cat_file = os.path.join(self.temp_dir, "concatenated_multiple.txt")
-        print(f"{Fore.CYAN}Step {len(valid_files) + 1}/{len(valid_files) + 2}: Concatenating files...{Style.RESET_ALL}")
-
-        with open(cat_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
-            for i, cleaned_file in enumerate(cleaned_files, 1):
-                with open(cleaned_file, 'r', encoding='utf-8', buffering=BUFFER_SIZE) as infile:
-                    shutil.copyfileobj(infile, outfile)
-                print(f"  Added file {i} to concatenation")
-
-        # Step 3: Sort and deduplicate
-        print(
-            f"{Fore.CYAN}Step {len(valid_files) + 2}/{len(valid_files) + 2}: Sorting and deduplicating...{Style.RESET_ALL}")
-        self.sorter.external_sort(cat_file, output_file, deduplicate=True, auto_verify=self.auto_verify)
+        # Clean, sort and deduplicate in one pass: the sorter reads the files directly,
+        # trimming lines and skipping empty ones, so no cleaned or concatenated copy is written
+        print(f"{Fore.CYAN}Step 1/1: Cleaning, sorting and deduplicating...{Style.RESET_ALL}")
+        cleaned_lines = self.sorter.external_sort(valid_files, output_file, deduplicate=True,
+                                                  auto_verify=self.auto_verify)
+        if cleaned_lines is None:
+            return output_file
+        print(f"  After cleaning: {Fore.GREEN}{cleaned_lines:,}{Style.RESET_ALL} lines")
 
         # Get final statistics
         final_lines = FileStats.count_lines(output_file, show_progress=False)
@@ -655,13 +1281,6 @@ class LargeFileProcessor:
         end_time = datetime.now()
         duration = end_time - start_time
 
-        # Cleanup temp files
-        for temp_file in cleaned_files + [cat_file]:
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-
         # Print summary
         print("\n" + "=" * 60)
         print(f"{Fore.GREEN}{Style.BRIGHT}MULTI-FILE MERGE COMPLETE!{Style.RESET_ALL}")
@@ -691,23 +1310,19 @@ class LargeFileProcessor:
             print(f"{Fore.RED}ERROR: '{folder_path}' is not a folder!{Style.RESET_ALL}")
             return None
 
-        # Get all files with the specified extension
-        all_files = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                if file.endswith(file_extension):
-                    all_files.append(os.path.join(root, file))
+        # Get all files with the specified extension. The folder is listed once, with file sizes
+        file_sizes = dict(iter_folder_files(folder_path))
+        all_files = [file for file in file_sizes if file.endswith(file_extension)]
 
         if not all_files:
             print(f"{Fore.YELLOW}No files found with extension '{file_extension}' in {folder_path}{Style.RESET_ALL}")
 
             # Show available extensions
             extensions = {}
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    ext = os.path.splitext(file)[1]
-                    if ext:
-                        extensions[ext] = extensions.get(ext, 0) + 1
+            for file in file_sizes:
+                ext = os.path.splitext(file)[1]
+                if ext:
+                    extensions[ext] = extensions.get(ext, 0) + 1
 
             if extensions:
                 print(f"\nAvailable extensions in folder:")
@@ -721,11 +1336,7 @@ class LargeFileProcessor:
                     file_extension = new_ext
 
                     # Try again with new extension
-                    all_files = []
-                    for root, dirs, files in os.walk(folder_path):
-                        for file in files:
-                            if file.endswith(file_extension):
-                                all_files.append(os.path.join(root, file))
+                    all_files = [file for file in file_sizes if file.endswith(file_extension)]
 
             if not all_files:
                 return None
@@ -765,52 +1376,20 @@ class LargeFileProcessor:
             return None
 
         # Sort files by size (process smaller files first for better progress estimation)
-        all_files.sort(key=lambda x: os.path.getsize(x))
+        all_files.sort(key=file_sizes.get)
 
         if output_file is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = os.path.join(folder_path, f"merged_all_files_{timestamp}.txt")
 
-        # Step 1: Clean and filter files
-        cleaned_files = []
-        print(f"\n{Fore.CYAN}Step 1/{len(all_files) + 2}: Cleaning and filtering files...{Style.RESET_ALL}")
-
-        for i, file_path in enumerate(all_files, 1):
-            cleaned_file = os.path.join(self.temp_dir, f"cleaned_filtered_{i:04d}.txt")
-
-            if filter_characters:
-                # Clean AND filter lines with characters
-                self._clean_and_filter_file(file_path, cleaned_file, filter_characters)
-            else:
-                # Just clean (original behavior)
-                self._clean_file(file_path, cleaned_file)
-
-            cleaned_lines = FileStats.count_lines(cleaned_file, show_progress=False)
-            original_lines = FileStats.count_lines(file_path, show_progress=False)
-
-            if filter_characters and original_lines > 0:
-                removed = original_lines - cleaned_lines
-                print(f"  File {i}: {Fore.GREEN}{cleaned_lines:,}{Style.RESET_ALL} lines "
-                      f"(removed {Fore.RED}{removed:,}{Style.RESET_ALL} lines with '{filter_characters}')")
-            else:
-                print(f"  File {i}: {Fore.GREEN}{cleaned_lines:,}{Style.RESET_ALL} lines")
-
-            cleaned_files.append(cleaned_file)
-
-        # Step 2: Concatenate cleaned files
-        cat_file = os.path.join(self.temp_dir, "concatenated_multiple_filtered.txt")
-        print(f"\n{Fore.CYAN}Step {len(all_files) + 1}/{len(all_files) + 2}: Concatenating files...{Style.RESET_ALL}")
-
-        with open(cat_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
-            for i, cleaned_file in enumerate(cleaned_files, 1):
-                with open(cleaned_file, 'r', encoding='utf-8', buffering=BUFFER_SIZE) as infile:
-                    shutil.copyfileobj(infile, outfile)
-                print(f"  Added file {i} to concatenation")
-
-        # Step 3: Sort and deduplicate
-        print(
-            f"\n{Fore.CYAN}Step {len(all_files) + 2}/{len(all_files) + 2}: Sorting and deduplicating...{Style.RESET_ALL}")
-        self.sorter.external_sort(cat_file, output_file, deduplicate=True, auto_verify=self.auto_verify)
+        # Clean, filter, sort and deduplicate in one pass: the sorter reads the files directly,
+        # trimming lines and skipping empty ones and lines with the filter characters
+        print(f"\n{Fore.CYAN}Step 1/1: Cleaning, filtering, sorting and deduplicating...{Style.RESET_ALL}")
+        cleaned_lines = self.sorter.external_sort(all_files, output_file, deduplicate=True,
+                                                  auto_verify=self.auto_verify, filter_characters=filter_characters)
+        if cleaned_lines is None:
+            return output_file
+        print(f"  After cleaning: {Fore.GREEN}{cleaned_lines:,}{Style.RESET_ALL} lines")
 
         # Get final statistics
         final_lines = FileStats.count_lines(output_file, show_progress=False)
@@ -819,13 +1398,6 @@ class LargeFileProcessor:
         total_original_lines = sum(FileStats.count_lines(f, show_progress=False) for f in all_files)
         duplicates_removed = total_original_lines - final_lines
 
-        # Cleanup temp files
-        for temp_file in cleaned_files + [cat_file]:
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-
         # Print summary
         print("\n" + "=" * 60)
         print(f"{Fore.GREEN}{Style.BRIGHT}FOLDER MERGE COMPLETE!{Style.RESET_ALL}")
@@ -835,8 +1407,7 @@ class LargeFileProcessor:
         print(f"Final unique lines: {Fore.GREEN}{final_lines:,}{Style.RESET_ALL}")
 
         if filter_characters:
-            lines_filtered = total_original_lines - sum(
-                FileStats.count_lines(f, show_progress=False) for f in cleaned_files)
+            lines_filtered = total_original_lines - cleaned_lines
             print(f"Lines filtered (containing '{filter_characters}'): {Fore.RED}{lines_filtered:,}{Style.RESET_ALL}")
 
         print(f"Duplicate lines removed: {Fore.RED}{duplicates_removed:,}{Style.RESET_ALL}")
@@ -846,21 +1417,6 @@ class LargeFileProcessor:
 
         return output_file
 
-    def _clean_and_filter_file(self, input_file, output_file, filter_characters):
-        """Clean file AND filter lines containing specific characters"""
-        with open(input_file, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as infile, \
-                open(output_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
-
-            for line_num, line in enumerate(infile, 1):
-                stripped = line.strip()
-
-                # Skip empty lines AND lines containing filter characters
-                if stripped and not any(char in stripped for char in filter_characters):
-                    outfile.write(stripped + '\n')
-
-                if line_num % 1000000 == 0:
-                    print(f"    Processed {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines...")
-
     def deduplicate_and_sort(self, input_file, output_file=None, remove_chars=False):
         """Option 1: Deduplicate and sort main file - Windows compatible"""
         print("\n" + "=" * 60)
@@ -885,11 +1441,11 @@ class LargeFileProcessor:
                 return output_file
 
         # Get initial statistics
-        initial_size = FileStats.get_file_size(input_file)
+        initial_bytes = os.path.getsize(input_file)
         initial_lines = FileStats.count_lines(input_file)
 
         print(f"\nInput File: {Fore.YELLOW}{input_file}{Style.RESET_ALL}")
-        print(f"Initial size: {Fore.GREEN}{initial_size}{Style.RESET_ALL}")
+        print(f"Initial size: {Fore.GREEN}{FileStats._humanize_size(initial_bytes)}{Style.RESET_ALL}")
         print(f"Initial lines: {Fore.GREEN}{initial_lines:,}{Style.RESET_ALL}")
 
         if initial_lines == 0:
@@ -912,24 +1468,19 @@ class LargeFileProcessor:
         print(f"\nProcessing {initial_lines:,} lines...")
         start_time = datetime.now()
 
-        # Step 1: Clean file (remove empty lines and trim spaces)
-        cleaned_file = os.path.join(self.temp_dir, "cleaned.txt")
-        print(f"{Fore.CYAN}Step 1/3: Cleaning file (removing empty lines, trimming spaces)...{Style.RESET_ALL}")
+        # Step 1: Clean (remove empty lines and trim spaces), sort and deduplicate.
+        # The sorter cleans lines as it reads them, so no cleaned copy of the input is written
+        print(f"{Fore.CYAN}Step 1/2: Cleaning, sorting and deduplicating...{Style.RESET_ALL}")
 
-        self._clean_file(input_file, cleaned_file)
-        cleaned_lines = FileStats.count_lines(cleaned_file, show_progress=False)
+        cleaned_lines = self.sorter.external_sort(input_file, output_file, deduplicate=True,
+                                                  auto_verify=self.auto_verify)
         print(f"  After cleaning: {Fore.GREEN}{cleaned_lines:,}{Style.RESET_ALL} lines")
 
-        # Step 2: Sort and deduplicate
-        print(f"{Fore.CYAN}Step 2/3: Sorting and deduplicating...{Style.RESET_ALL}")
-
-        self.sorter.external_sort(cleaned_file, output_file, deduplicate=True, auto_verify=self.auto_verify)
-
-        # Step 3: Final statistics
-        print(f"{Fore.CYAN}Step 3/3: Calculating final statistics...{Style.RESET_ALL}")
+        # Step 2: Final statistics
+        print(f"{Fore.CYAN}Step 2/2: Calculating final statistics...{Style.RESET_ALL}")
 
         final_lines = FileStats.count_lines(output_file, show_progress=False)
-        final_size = FileStats.get_file_size(output_file)
+        final_bytes = os.path.getsize(output_file)
         empty_lines_removed = initial_lines - cleaned_lines
         duplicates_removed = cleaned_lines - final_lines
         total_removed = initial_lines - final_lines
@@ -938,11 +1489,6 @@ class LargeFileProcessor:
         duration = end_time - start_time
 
         # Cleanup temp files
-        for temp_file in [cleaned_file]:
-            try:
-                os.remove(temp_file)
-            except:
-                pass
         if 'temp_file' in locals() and os.path.exists(temp_file):
             try:
                 os.remove(temp_file)
@@ -952,7 +1498,7 @@ class LargeFileProcessor:
         self._print_summary(
             initial_lines, final_lines, total_removed,
             empty_lines_removed, duplicates_removed,
-            initial_size, final_size, input_file, output_file, duration
+            initial_bytes, final_bytes, input_file, output_file, duration
         )
 
         return output_file
@@ -999,51 +1545,26 @@ class LargeFileProcessor:
 
         start_time = datetime.now()
 
-        # Step 1: Clean and concatenate files
-        cleaned1 = os.path.join(self.temp_dir, "cleaned1.txt")
-        cleaned2 = os.path.join(self.temp_dir, "cleaned2.txt")
-
-        print(f"{Fore.CYAN}Step 1/3: Cleaning files (removing empty lines)...{Style.RESET_ALL}")
-
-        # Clean both files
-        self._clean_file(file1, cleaned1)
-        self._clean_file(file2, cleaned2)
+        # Clean, sort and deduplicate in one pass: the sorter reads both files directly,
+        # trimming lines and skipping empty ones, so no cleaned or concatenated copy is written
+        print(f"{Fore.CYAN}Step 1/1: Cleaning, sorting and deduplicating...{Style.RESET_ALL}")
 
-        cleaned_lines1 = FileStats.count_lines(cleaned1, show_progress=False)
-        cleaned_lines2 = FileStats.count_lines(cleaned2, show_progress=False)
-        empty_removed = total_initial_lines - (cleaned_lines1 + cleaned_lines2)
+        cleaned_lines = self.sorter.external_sort([file1, file2], output_file, deduplicate=True,
+                                                  auto_verify=self.auto_verify)
+        if cleaned_lines is None:
+            return output_file
+        empty_removed = total_initial_lines - cleaned_lines
 
         print(f"  Empty lines removed: {Fore.RED}{empty_removed:,}{Style.RESET_ALL}")
 
-        # Step 2: Concatenate cleaned files
-        cat_file = os.path.join(self.temp_dir, "concatenated.txt")
-        print(f"{Fore.CYAN}Step 2/3: Concatenating cleaned files...{Style.RESET_ALL}")
-
-        with open(cat_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
-            for infile in [cleaned1, cleaned2]:
-                with open(infile, 'r', encoding='utf-8', buffering=BUFFER_SIZE) as f:
-                    shutil.copyfileobj(f, outfile)
-
-        # Step 3: Sort and deduplicate
-        print(f"{Fore.CYAN}Step 3/3: Sorting and deduplicating...{Style.RESET_ALL}")
-
-        self.sorter.external_sort(cat_file, output_file, deduplicate=True, auto_verify=self.auto_verify)
-
         # Get final statistics
         final_lines = FileStats.count_lines(output_file, show_progress=False)
-        duplicates_removed = (cleaned_lines1 + cleaned_lines2) - final_lines
+        duplicates_removed = cleaned_lines - final_lines
         total_removed = total_initial_lines - final_lines
 
         end_time = datetime.now()
         duration = end_time - start_time
 
-        # Cleanup temp files
-        for temp_file in [cleaned1, cleaned2, cat_file]:
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-
         print("\n" + "=" * 60)
         print(f"{Fore.GREEN}{Style.BRIGHT}MERGE COMPLETE!{Style.RESET_ALL}")
         print("=" * 60)
@@ -1064,6 +1585,10 @@ class LargeFileProcessor:
 
     def search_in_file(self, filepath, search_term, case_sensitive=True, max_results=100):
         """Search for a term in a large file"""
+        return self.search_multi_in_file(filepath, [search_term], case_sensitive, max_results)
+
+    def search_multi_in_file(self, filepath, search_terms, case_sensitive=True, max_results=100):
+        """Search for any of several terms in a large file in a single pass"""
         print("\n" + "=" * 60)
         print(f"{Fore.CYAN}{Style.BRIGHT}SEARCHING IN: {os.path.basename(filepath)}{Style.RESET_ALL}")
         print("=" * 60)
@@ -1076,9 +1601,23 @@ class LargeFileProcessor:
         print(f"Total lines in file: {Fore.GREEN}{lines_count:,}{Style.RESET_ALL}")
 
         if not case_sensitive:
-            search_term = search_term.lower()
+            search_terms = [term.lower() for term in search_terms]
+
+        # All terms are combined into one alternation (longest first) so the file is scanned once
+        terms = sorted(set(search_terms), key=len, reverse=True)
+        pattern = re.compile('|'.join(map(re.escape, terms)), 0 if case_sensitive else re.IGNORECASE)
+        if all(term.isascii() for term in terms):
+            # ASCII terms are searched in the raw bytes without decoding every block, and
+            # case-insensitively in a lowercased block, which is faster than re.IGNORECASE.
+            # A single term is found with bytes.find, several times faster than a regex
+            encoded = [term.encode('ascii') for term in terms]
+            scan_pattern = encoded[0] if len(encoded) == 1 else re.compile(b'|'.join(map(re.escape, encoded)))
+            fold_case = not case_sensitive
+        else:
+            scan_pattern = pattern
+            fold_case = False
 
-        print(f"Searching for: {Fore.YELLOW}'{search_term}'{Style.RESET_ALL}")
+        print(f"Searching for: {Fore.YELLOW}{', '.join(repr(term) for term in search_terms)}{Style.RESET_ALL}")
         print(f"Case sensitive: {Fore.CYAN}{'Yes' if case_sensitive else 'No'}{Style.RESET_ALL}")
         print(f"Max results to show: {Fore.CYAN}{max_results}{Style.RESET_ALL}")
         print("\nSearching... (Ctrl+C to stop)")
@@ -1087,24 +1626,17 @@ class LargeFileProcessor:
         line_numbers = []
 
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
-                for line_num, line in enumerate(f, 1):
-                    line_to_check = line if case_sensitive else line.lower()
-
-                    if search_term in line_to_check:
-                        matches.append(line.strip())
-                        line_numbers.append(line_num)
+            for line_num, line in self._iter_matching_lines(filepath, scan_pattern, fold_case):
+                matches.append(line.strip())
+                line_numbers.append(line_num)
 
-                        if len(matches) % 1000 == 0:
-                            print(f"  Found {Fore.YELLOW}{len(matches):,}{Style.RESET_ALL} matches so far...")
+                if len(matches) % 1000 == 0:
+                    print(f"  Found {Fore.YELLOW}{len(matches):,}{Style.RESET_ALL} matches so far...")
 
-                        if len(matches) >= max_results * 10:  # Stop early if too many
-                            print(
-                                f"\nStopping search - found {Fore.YELLOW}{len(matches):,}{Style.RESET_ALL} matches (showing first {max_results})")
-                            break
-
-                    if line_num % 1000000 == 0:
-                        print(f"  Scanned {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines...")
+                if len(matches) >= max_results * 10:  # Stop early if too many
+                    print(
+                        f"\nStopping search - found {Fore.YELLOW}{len(matches):,}{Style.RESET_ALL} matches (showing first {max_results})")
+                    break
 
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Search interrupted by user.{Style.RESET_ALL}")
@@ -1119,16 +1651,8 @@ class LargeFileProcessor:
             print("-" * 40)
 
             for i, (match, line_num) in enumerate(zip(matches[:max_results], line_numbers[:max_results]), 1):
-                # Highlight the search term in the result
-                if case_sensitive:
-                    highlighted = match.replace(search_term, f"{Fore.RED}{search_term}{Style.RESET_ALL}")
-                else:
-                    # Case insensitive highlighting
-                    import re
-                    highlighted = re.sub(f'({re.escape(search_term)})',
-                                         f'{Fore.RED}\\1{Style.RESET_ALL}',
-                                         match,
-                                         flags=re.IGNORECASE)
+                # Highlight the search terms in the result
+                highlighted = pattern.sub(lambda m: f"{Fore.RED}{m.group(0)}{Style.RESET_ALL}", match)
 
                 print(
                     f"{Fore.CYAN}{i:4}.{Style.RESET_ALL} Line {Fore.YELLOW}{line_num:,}{Style.RESET_ALL}: {highlighted}")
@@ -1137,6 +1661,54 @@ class LargeFileProcessor:
 
         return matches
 
+    @staticmethod
+    def _iter_matching_lines(filepath, pattern, fold_case=False):
+        """Yield (line number, line) for each line matching pattern
+
+        Whole blocks are searched with the compiled pattern and only the lines around a
+        match are sliced out, so lines without a match never reach Python code.
+        A bytes pattern (compiled, or a plain bytes string found with bytes.find) searches
+        the raw blocks without decoding them, and with fold_case a lowercased copy of each
+        block (for a pattern written in lowercase).
+        """
+        if isinstance(pattern, bytes):
+            binary = True
+
+            def find(haystack, pos):
+                start = haystack.find(pattern, pos)
+                return (start, start + len(pattern)) if start != -1 else None
+        else:
+            binary = isinstance(pattern.pattern, bytes)
+
+            def find(haystack, pos):
+                match = pattern.search(haystack, pos)
+                return match.span() if match else None
+        newline = b'\n' if binary else '\n'
+        line_num = 0  # Lines before the current block
+        for block in iter_file_blocks(filepath):
+            text = block if binary else block.decode('utf-8', errors='ignore')
+            # bytes.lower() only changes ASCII letters, so offsets stay the same as in text
+            haystack = text.lower() if fold_case else text
+            search_pos = counted = 0
+            while True:
+                match = find(haystack, search_pos)
+                if match is None:
+                    break
+                start = text.rfind(newline, 0, match[0]) + 1
+                end = text.find(newline, match[1])
+                if end == -1:
+                    end = len(text)
+                line_num += text.count(newline, counted, start)
+                counted = start
+                line = text[start:end]
+                yield line_num + 1, line.decode('utf-8', errors='ignore') if binary else line
+                search_pos = end + 1
+
+            previous = line_num
+            line_num += text.count(newline, counted)
+            if line_num // 1000000 != previous // 1000000:
+                print(f"  Scanned {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines...")
+
     def show_lines(self, filepath, start_line, end_line):
         """Display specific lines from a file"""
         print("\n" + "=" * 60)
@@ -1165,15 +1737,18 @@ class LargeFileProcessor:
         print("-" * 40)
 
         lines_displayed = 0
-        with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
-            for line_num, line in enumerate(f, 1):
-                if line_num < start_line:
-                    continue
-                if line_num > end_line:
+        # Seek straight to the first line instead of decoding every line before it
+        with open(filepath, 'rb') as f:
+            f.seek(find_line_offset(filepath, start_line))
+            numbered = zip(range(start_line, end_line + 1), f)
+            # Print in batches with one write each instead of a print() per line
+            while True:
+                batch = [f"{Fore.CYAN}{line_num:8,}:{Style.RESET_ALL} {line.decode('utf-8', errors='ignore').rstrip()}\n"
+                         for line_num, line in islice(numbered, 10000)]
+                if not batch:
                     break
-
-                print(f"{Fore.CYAN}{line_num:8,}:{Style.RESET_ALL} {line.rstrip()}")
-                lines_displayed += 1
+                sys.stdout.write(''.join(batch))
+                lines_displayed += len(batch)
 
         print(f"\nDisplayed {Fore.GREEN}{lines_displayed:,}{Style.RESET_ALL} lines.")
 
@@ -1198,18 +1773,27 @@ class LargeFileProcessor:
         print("\nProcessing...")
         start_time = datetime.now()
 
-        # Python implementation (no sed needed)
-        with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as infile, \
-                open(output_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
+        # Python implementation (no sed needed). Deleting characters does not depend on
+        # line boundaries, so whole blocks are cleaned in C without decoding them: ASCII
+        # characters are single bytes removed in one translate pass, other characters are
+        # removed as their UTF-8 byte sequences. Blocks end on a line boundary, so no
+        # sequence is ever split between two blocks
+        delete_bytes = ''.join(char for char in characters_to_delete if char.isascii()).encode('ascii')
+        delete_sequences = [char.encode('utf-8') for char in set(characters_to_delete) if not char.isascii()]
 
-            for line_num, line in enumerate(infile, 1):
-                # Remove specified characters
-                for char in characters_to_delete:
-                    line = line.replace(char, '')
-                outfile.write(line)
+        with open(output_file, 'wb', buffering=BUFFER_SIZE) as outfile:
+            lines_done = 0
+            for block in iter_file_blocks(filepath):
+                previous = lines_done
+                lines_done += block.count(b'\n')
 
-                if line_num % 1000000 == 0:
-                    print(f"  Processed {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines...")
+                block = block.translate(None, delete_bytes)
+                for sequence in delete_sequences:
+                    block = block.replace(sequence, b'')
+                outfile.write(block)
+
+                if lines_done // 1000000 != previous // 1000000:
+                    print(f"  Processed {Fore.YELLOW}{lines_done:,}{Style.RESET_ALL} lines...")
 
         final_lines = FileStats.count_lines(output_file, show_progress=False)
         end_time = datetime.now()
@@ -1272,13 +1856,24 @@ class LargeFileProcessor:
         print(f"\nLast 5 lines:")
         print("-" * 40)
         try:
-            # Read last lines manually
+            # Read 64 KB blocks backwards until the tail holds the last 5 lines whole,
+            # so long lines are not cut off and a short file is read only once
             with open(filepath, 'rb') as f:
-                f.seek(-min(5000, os.path.getsize(filepath)), os.SEEK_END)
-                last_lines = f.read().decode('utf-8', errors='ignore').split('\n')[-6:-1]
-                for i, line in enumerate(last_lines, 1):
-                    print(f"  {Fore.CYAN}{i}:{Style.RESET_ALL} {line}")
-        except:
+                pos = size_bytes
+                tail = b''
+                while pos > 0 and tail.count(b'\n') <= 5:
+                    step = min(65536, pos)
+                    pos -= step
+                    f.seek(pos)
+                    tail = f.read(step) + tail
+            # Split only the last few lines off the tail and decode just those
+            if tail.endswith(b'\n'):
+                tail = tail[:-1]
+            last_lines = tail.rsplit(b'\n', 5)[-5:] if tail else []
+            for i, line in enumerate(last_lines, 1):
+                line = line.rstrip(b'\r').decode('utf-8', errors='ignore')
+                print(f"  {Fore.CYAN}{i}:{Style.RESET_ALL} {line}")
+        except OSError:
             print(f"  {Fore.YELLOW}(Could not read last lines){Style.RESET_ALL}")
 
         # File age
@@ -1325,19 +1920,24 @@ class LargeFileProcessor:
 
         if replace == 'y':
             try:
-                # Backup original file
+                # Backup original file, renaming instead of copying it
                 backup_file = filepath + ".bak"
-                shutil.copy2(filepath, backup_file)
+                os.replace(filepath, backup_file)
 
-                # Replace original with sorted
-                os.remove(filepath)
-                shutil.move(sorted_file, filepath)
+                # Replace original with sorted, putting the original back if that fails
+                try:
+                    os.replace(sorted_file, filepath)
+                except OSError:
+                    os.replace(backup_file, filepath)
+                    raise
 
                 print(f"{Fore.GREEN}✓ Original file replaced with sorted version.{Style.RESET_ALL}")
                 print(f"{Fore.YELLOW}Backup saved as: {backup_file}{Style.RESET_ALL}")
                 return filepath
             except Exception as e:
                 print(f"{Fore.RED}Error replacing file: {e}{Style.RESET_ALL}")
+                if not os.path.exists(filepath) and os.path.exists(backup_file):
+                    print(f"{Fore.YELLOW}Original file saved as: {backup_file}{Style.RESET_ALL}")
                 print(f"{Fore.YELLOW}Sorted file saved as: {sorted_file}{Style.RESET_ALL}")
                 return sorted_file
         else:
@@ -1361,28 +1961,26 @@ class LargeFileProcessor:
         print(f"Analyzing Bitcoin addresses in {os.path.basename(filepath)}...")
         print(f"Sampling first {sample_size:,} addresses...")
 
-        address_types = {}
-        valid_count = 0
-        invalid_count = 0
-        total_count = 0
-
         with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as f:
-            for i, line in enumerate(f):
-                if i >= sample_size:
-                    break
-
-                address = line.strip()
-                total_count += 1
-
-                if BitcoinAddressProcessor.is_valid_bitcoin_address(address):
-                    valid_count += 1
-                    addr_type = BitcoinAddressProcessor.get_address_type(address)
-                    address_types[addr_type] = address_types.get(addr_type, 0) + 1
-                else:
-                    invalid_count += 1
-
-                if i % 10000 == 0 and i > 0:
-                    print(f"  Analyzed {Fore.YELLOW}{i:,}{Style.RESET_ALL} addresses...")
+            lines = list(islice(f, sample_size))
+        total_count = len(lines)
+
+        # Validate the whole sample with one regex scan instead of one call per address
+        valid = BitcoinAddressProcessor.ADDRESS_LINE_PATTERN.findall(''.join(lines))
+        valid_count = len(valid)
+        invalid_count = total_count - valid_count
+
+        # Count the types (as in get_address_type) by prefix over the joined addresses
+        valid_text = '\n' + '\n'.join(valid)
+        taproot_count = valid_text.count('\nbc1p')
+        address_types = {
+            "P2PKH (Legacy)": valid_text.count('\n1'),
+            "P2SH (Legacy)": valid_text.count('\n3'),
+            "P2WPKH (Native SegWit)": valid_text.count('\nbc1') - taproot_count,
+            "P2TR (Taproot)": taproot_count,
+            "P2SH (Testnet)": valid_text.count('\n2'),
+        }
+        address_types = {addr_type: count for addr_type, count in address_types.items() if count}
 
         print("\nAnalysis Results:")
         print(f"Total addresses sampled: {Fore.YELLOW}{total_count:,}{Style.RESET_ALL}")
@@ -1393,7 +1991,7 @@ class LargeFileProcessor:
 
         if valid_count > 0:
             print(f"\nValid Address Types:")
-            for addr_type, count in sorted(address_types.items(), key=lambda x: x[1], reverse=True):
+            for addr_type, count in sorted(address_types.items(), key=itemgetter(1), reverse=True):
                 percentage = count / valid_count * 100
                 color = Fore.GREEN if percentage > 30 else Fore.YELLOW if percentage > 10 else Fore.CYAN
                 print(f"  {addr_type}: {color}{count:,}{Style.RESET_ALL} ({percentage:.2f}%)")
@@ -1405,37 +2003,14 @@ class LargeFileProcessor:
             'types': address_types
         }
 
-    def _clean_file(self, input_file, output_file):
-        """Clean file: remove empty lines and trim spaces"""
-        with open(input_file, 'r', encoding='utf-8', errors='ignore', buffering=BUFFER_SIZE) as infile, \
-                open(output_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as outfile:
-
-            for line_num, line in enumerate(infile, 1):
-                stripped = line.strip()
-                if stripped:  # Skip empty lines
-                    outfile.write(stripped + '\n')
-
-                if line_num % 1000000 == 0:
-                    print(f"  Cleaned {Fore.YELLOW}{line_num:,}{Style.RESET_ALL} lines...")
-
     def _check_disk_space(self, input_file):
         """Check if there's enough disk space"""
         try:
-            import ctypes
-            free_bytes = ctypes.c_ulonglong(0)
-            total_bytes = ctypes.c_ulonglong(0)
-
-            # Get free disk space on Windows
-            ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-                ctypes.c_wchar_p(self.temp_dir),
-                None,
-                ctypes.pointer(total_bytes),
-                ctypes.pointer(free_bytes)
-            )
-
-            free_space = free_bytes.value
+            # GetDiskFreeSpaceExW on Windows, statvfs elsewhere
+            free_space = shutil.disk_usage(self.temp_dir).free
             file_size = os.path.getsize(input_file)
-            required_space = file_size * 2  # Need space for temp files
+            # Need space for temp files, less when GNU sort compresses them
+            required_space = int(file_size * (1.3 if self.sorter.use_system_sort and find_gnu_sort() and find_temp_compressor() else 2))
 
             if free_space < required_space:
                 print(f"\n{Fore.YELLOW}WARNING: Low disk space in {self.temp_dir}{Style.RESET_ALL}")
@@ -1444,7 +2019,7 @@ class LargeFileProcessor:
                 print(f"{Fore.YELLOW}Consider using a different TEMP_DIR with more space{Style.RESET_ALL}")
                 if input(f"{Fore.RED}Continue anyway? (y/n): {Style.RESET_ALL}").lower() != 'y':
                     return False
-        except:
+        except OSError:
             # Fallback if we can't get disk space info
             print(f"{Fore.YELLOW}Note: Using temp directory: {self.temp_dir}{Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Make sure you have at least 2x the input file size free space.{Style.RESET_ALL}")
@@ -1453,8 +2028,8 @@ class LargeFileProcessor:
 
     def _print_summary(self, initial_lines, final_lines, total_removed,
                        empty_removed, duplicates_removed,
-                       initial_size, final_size, input_file, output_file, duration):
-        """Print processing summary"""
+                       initial_bytes, final_bytes, input_file, output_file, duration):
+        """Print processing summary, the sizes are given in bytes"""
         print("\n" + "=" * 60)
         print(f"{Fore.GREEN}{Style.BRIGHT}PROCESSING COMPLETE!{Style.RESET_ALL}")
         print("=" * 60)
@@ -1466,19 +2041,33 @@ class LargeFileProcessor:
         print(f"Duplicate lines removed: {Fore.RED}{duplicates_removed:,}{Style.RESET_ALL}")
         print(f"Total lines removed: {Fore.RED}{total_removed:,}{Style.RESET_ALL}")
         print(f"Compression: {Fore.CYAN}{(total_removed / initial_lines * 100):.2f}%{Style.RESET_ALL} reduction")
-        print(f"\nInitial size: {initial_size}")
-        print(f"Final size: {final_size}")
-        size_saved = os.path.getsize(input_file) - os.path.getsize(output_file)
+        print(f"\nInitial size: {FileStats._humanize_size(initial_bytes)}")
+        print(f"Final size: {FileStats._humanize_size(final_bytes)}")
+        size_saved = initial_bytes - final_bytes
         print(f"Space saved: {Fore.GREEN}{FileStats._humanize_size(size_saved)}{Style.RESET_ALL}")
         print(f"\nTime taken: {duration}")
         print(
             f"Processing speed: {Fore.CYAN}{initial_lines / duration.total_seconds():,.0f}{Style.RESET_ALL} lines/sec")
 
 
+def complete_path(text, state):
+    """readline completer for file paths, directories get a trailing separator"""
+    if state == 0:
+        complete_path.matches = [path + os.sep if os.path.isdir(path) else path
+                                 for path in sorted(glob.glob(glob.escape(os.path.expanduser(text)) + '*'))]
+    return complete_path.matches[state] if state < len(complete_path.matches) else None
+
+
 def interactive_menu():
     """Interactive menu for the user"""
     processor = LargeFileProcessor()
 
+    if readline is not None:
+        # Prompts take whole paths, so only tabs and newlines end the text being completed
+        readline.set_completer(complete_path)
+        readline.set_completer_delims('\t\n')
+        readline.parse_and_bind('tab: complete')
+
     while True:
         print("\n" + "=" * 70)
         print(f"{Fore.CYAN}{Style.BRIGHT}WINDOWS LARGE FILE MANAGEMENT TOOL{Style.RESET_ALL}")
@@ -1530,18 +2119,14 @@ def interactive_menu():
         elif choice == '3':
             print(f"{Fore.CYAN}Enter file paths (one per line, empty line to finish):{Style.RESET_ALL}")
             file_list = []
-            i = 1
             while True:
-                file_path = input(f"File {i} (or press Enter to finish): ").strip()
+                file_path = input(f"File {len(file_list) + 1} (or press Enter to finish): ").strip()
                 if not file_path:
-                    if i == 1:
+                    if not file_list:
                         print(f"{Fore.YELLOW}No files specified!{Style.RESET_ALL}")
-                        break
-                    else:
-                        break
+                    break
                 if os.path.exists(file_path):
                     file_list.append(file_path)
-                    i += 1
                 else:
                     print(f"{Fore.RED}File not found: {file_path}{Style.RESET_ALL}")
 
@@ -1602,21 +2187,22 @@ def interactive_menu():
 
         elif choice == '6':
             file_path = input(f"File to search [{INPUT_FILE}]: ").strip() or INPUT_FILE
-            search_term = input("Search term: ").strip()
-            if not search_term:
+            search_terms = [term.strip() for term in input("Search terms (comma-separated): ").split(',')]
+            search_terms = [term for term in search_terms if term]
+            if not search_terms:
                 print(f"{Fore.RED}Search term cannot be empty!{Style.RESET_ALL}")
                 continue
             case_sensitive = input("Case sensitive? (y/n) [n]: ").strip().lower() != 'y'
             max_results = input("Max results to show [100]: ").strip()
-            max_results = int(max_results) if max_results.isdigit() else 100
-            processor.search_in_file(file_path, search_term, case_sensitive, max_results)
+            max_results = int(max_results) if max_results.isdecimal() else 100
+            processor.search_multi_in_file(file_path, search_terms, case_sensitive, max_results)
 
         elif choice == '7':
             file_path = input(f"File [{INPUT_FILE}]: ").strip() or INPUT_FILE
             start_line = input("Start line [1]: ").strip()
-            start_line = int(start_line) if start_line.isdigit() else 1
+            start_line = int(start_line) if start_line.isdecimal() else 1
             end_line = input("End line [100]: ").strip()
-            end_line = int(end_line) if end_line.isdigit() else 100
+            end_line = int(end_line) if end_line.isdecimal() else 100
             processor.show_lines(file_path, start_line, end_line)
 
         elif choice == '8':
@@ -1649,7 +2235,7 @@ def interactive_menu():
         elif choice == '12':
             file_path = input(f"Bitcoin addresses file [{INPUT_FILE}]: ").strip() or INPUT_FILE
             sample_size = input("Sample size for analysis [100000]: ").strip()
-            sample_size = int(sample_size) if sample_size.isdigit() else 100000
+            sample_size = int(sample_size) if sample_size.isdecimal() else 100000
             print(f"\nAnalyzing first {sample_size:,} addresses...")
             processor.analyze_bitcoin_file(file_path, sample_size)
 
@@ -1695,7 +2281,7 @@ def display_banner():
     print(f"  {Fore.GREEN}•{Style.RESET_ALL} External sorting with minimal memory usage")
     print(f"  {Fore.GREEN}•{Style.RESET_ALL} Auto-verify sorting and auto-fix if not sorted")
     print(f"  {Fore.GREEN}•{Style.RESET_ALL} Check any file's sorting status (Option 13)")
-    print(f"  {Fore.GREEN}•{Style.RESET_ALL} No Linux commands required - pure Python")
+    print(f"  {Fore.GREEN}•{Style.RESET_ALL} Sorts with GNU sort (and zstd) when found on PATH, pure Python otherwise")
     print("=" * 70)
 
 
@@ -1744,9 +2330,8 @@ def main():
 if __name__ == "__main__":
     # Set console to UTF-8 on Windows
     if sys.platform == "win32":
-        import io
-
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+        # Change the encoding of the existing streams instead of wrapping their buffers again
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
 
     main()